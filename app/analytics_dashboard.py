@@ -1,126 +1,218 @@
+import io
+import threading
 import streamlit as st
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from dashboard import load_data
+from data_loader import load_summaries, summaries_version
+
+# Rendered charts kept across reruns and sessions; the least recently used are evicted first
+FIGURE_CACHE_ENTRIES = 64
+
+# pyplot keeps global state, so figures are drawn one at a time across sessions
+FIGURE_LOCK = threading.Lock()
+
+
+def select_dimension(rollup, dataset, dimension):
+    """
+    @return: The all-years rollup rows of one dataset and dimension, indexed by value.
+    """
+    return rollup[(rollup['dataset'] == dataset) & (rollup['dimension'] == dimension)].set_index('value')
+
+
+def mean_salary(rows):
+    """@return: Mean salary per rollup row."""
+    return rows['salary_sum'] / rows['salary_count']
+
+
+def total_jobs(rollup, dataset):
+    """@return: Number of jobs in a dataset, 0 when it is missing."""
+    rows = select_dimension(rollup, dataset, 'all')
+    return int(rows['jobs'].iloc[0]) if not rows.empty else 0
+
+
+def plot_salary_histogram(summaries, dataset, xlabel):
+    """
+    Plots a precomputed salary histogram. The KDE is fitted to the weighted bin centers,
+    so its cost does not depend on the number of salaries.
+    """
+    histogram = summaries['salary_histogram']
+    bins = histogram[histogram['dataset'] == dataset]
+    fig, ax = plt.subplots(figsize=(10, 6))
+    # The precomputed bins have equal widths, so they are passed as a count and range
+    sns.histplot(x=(bins['bin_left'] + bins['bin_right']) / 2, weights=bins['jobs'], bins=len(bins),
+                 binrange=(bins['bin_left'].iloc[0], bins['bin_right'].iloc[-1]), kde=True, ax=ax)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel("Frequency")
+    return fig
+
+
+def plot_top_values(summaries, dataset, dimension, measure, top, xlabel, ylabel):
+    """Plots the values of a dimension with the most jobs or the highest mean salary."""
+    rows = select_dimension(summaries['rollup'], dataset, dimension)
+    values = (rows['jobs'] if measure == 'jobs' else mean_salary(rows)).nlargest(top)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=values.values, y=values.index, ax=ax)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    return fig
+
+
+def plot_jobs_by_year(summaries, dataset):
+    jobs_by_year = select_dimension(summaries['rollup'], dataset, 'year')['jobs']
+    jobs_by_year.index = jobs_by_year.index.astype(int)
+    jobs_by_year = jobs_by_year.sort_index()
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.lineplot(x=jobs_by_year.index, y=jobs_by_year.values, ax=ax)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Number of Jobs")
+    return fig
+
+
+def plot_top_titles(summaries, dataset, top):
+    top_titles = select_dimension(summaries['rollup'], dataset, 'title')['jobs'].nlargest(top)
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.pie(top_titles, labels=top_titles.index, autopct='%1.1f%%')
+    ax.set_title(f"Top {top} Job Titles")
+    return fig
+
+
+def plot_sponsor_counts(summaries, dataset):
+    sponsor_counts = select_dimension(summaries['rollup'], dataset, 'h1b_sponsor')['jobs']
+    sponsor_counts = sponsor_counts.rename({'True': 'H1B Sponsor', 'False': 'No H1B Record'})
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=sponsor_counts.index, y=sponsor_counts.values, ax=ax)
+    ax.set_ylabel("Number of Jobs")
+    return fig
+
+
+def plot_average_salaries(summaries, datasets, labels):
+    """Plots the mean salary of each dataset side by side."""
+    averages = [mean_salary(select_dimension(summaries['rollup'], dataset, 'all')).iloc[0] for dataset in datasets]
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(x=list(labels), y=averages, ax=ax)
+    ax.set_ylabel('Average Salary')
+    return fig
+
+
+CHARTS = {chart.__name__: chart for chart in [plot_salary_histogram, plot_top_values, plot_jobs_by_year,
+                                              plot_top_titles, plot_sponsor_counts, plot_average_salaries]}
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def render_chart(version, chart, params, _summaries):
+    """
+    Renders a chart to PNG bytes, once per version of the summaries and chart parameters.
+    The summaries are not hashed; the version identifies them.
+    @param version: Version of the dashboard database the summaries were loaded from.
+    @param chart: Name of the plot function in CHARTS.
+    @param params: Tuple of (name, value) arguments of the plot function.
+    @param _summaries: Summaries from load_summaries.
+    @return: PNG image bytes.
+    """
+    with FIGURE_LOCK:
+        fig = CHARTS[chart](_summaries, **dict(params))
+        try:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', bbox_inches='tight')
+        finally:
+            # Release the figure, or pyplot keeps every one ever drawn
+            plt.close(fig)
+    return buffer.getvalue()
+
+
+def chart_key(chart, params):
+    """@return: Tuple of the chart name and its sorted parameters, as render_chart takes them."""
+    return chart.__name__, tuple(sorted(params.items()))
+
+
+def analytics_charts(rollup):
+    """
+    Lists the charts of the analytics tab, skipping those without data.
+    @param rollup: All-years rollup from load_summaries.
+    @return: List of (title, plot function, parameters) in display order.
+    """
+    h1b_jobs = total_jobs(rollup, 'h1b')
+    current_jobs = total_jobs(rollup, 'current')
+    charts = []
 
-def analytics_tab():
-    st.subheader("Data Analytics")
-
-    # Fetch data from both tables
-    h1b_data = pd.read_csv("scrape/h1b/scrape_h1b.csv")
-    current_jobs_data = pd.read_csv("data_processing/processed_aggregated_data.csv")
+    # H1B Data Analysis
+    if h1b_jobs:
+        charts += [
+            ("H1B Jobs Salary Distribution", plot_salary_histogram, dict(dataset='h1b', xlabel="Base Salary")),
+            # 2. Top Employers in H1B Jobs
+            ("Top Employers in H1B Jobs", plot_top_values,
+             dict(dataset='h1b', dimension='employer', measure='jobs', top=10, xlabel="Number of Jobs",
+                  ylabel="Employers")),
+            # 3. Job Distribution by Year
+            ("Job Distribution by Year (H1B Jobs)", plot_jobs_by_year, dict(dataset='h1b')),
+            # 4. Job Titles Pie Chart
+            ("Job Titles Distribution (H1B Jobs)", plot_top_titles, dict(dataset='h1b', top=5)),
+        ]
+
+    # Current Jobs Data Analysis, over the postings with a salary range
+    if current_jobs:
+        charts += [
+            # 7. Technology Frequency
+            ("Technology Frequency (Current Jobs)", plot_top_values,
+             dict(dataset='current', dimension='tech', measure='jobs', top=10, xlabel="Frequency",
+                  ylabel="Technology")),
+            # 9. Company-wise Job Distribution
+            ("Company-wise Job Distribution (Current Jobs)", plot_top_values,
+             dict(dataset='current', dimension='employer', measure='jobs', top=10, xlabel="Number of Jobs",
+                  ylabel="Company")),
+            # 10. Location-based Job Distribution
+            ("Location-based Job Distribution (Current Jobs)", plot_top_values,
+             dict(dataset='current', dimension='location', measure='jobs', top=10, xlabel="Number of Jobs",
+                  ylabel="Location")),
+        ]
+
+        # H1B sponsorship of current jobs, from the columns added by data_processing/process_data.py
+        if not select_dimension(rollup, 'current', 'h1b_sponsor').empty:
+            charts.append(("Current Jobs at H1B Sponsors", plot_sponsor_counts, dict(dataset='current')))
+
+        if total_jobs(rollup, 'current_h1b_matched'):
+            charts.append(("Posted vs H1B Salary (Same Employer and Title)", plot_average_salaries,
+                           dict(datasets=('current_h1b_matched', 'h1b_matched_median'),
+                                labels=('Posted Salary', 'H1B Median Salary'))))
+
+        if h1b_jobs:
+            charts += [
+                ("Average Base Salary Comparison", plot_average_salaries,
+                 dict(datasets=('h1b', 'current'), labels=('H1B Jobs', 'Current Jobs'))),
+                # Salary Distribution for Current Jobs
+                ("Salary Distribution (Current Jobs)", plot_salary_histogram,
+                 dict(dataset='current', xlabel="Average Salary")),
+                # Salary by Location (For either dataset if location data is consistent)
+                ("Salary by Location", plot_top_values,
+                 dict(dataset='h1b', dimension='location', measure='salary', top=10, xlabel="Average Salary",
+                      ylabel="Location")),
+                # Tech-wise Salary Distribution
+                ("Tech-wise Salary Distribution", plot_top_values,
+                 dict(dataset='current', dimension='tech', measure='salary', top=10, xlabel="Average Salary",
+                      ylabel="Technology")),
+            ]
+    return charts
+
+
+def warm_charts():
+    """Renders every analytics chart into the figure cache, without displaying them."""
+    summaries = load_summaries()
+    if summaries is None:
+        return
+    version = summaries_version()
+    for _, chart, params in analytics_charts(summaries['rollup']):
+        render_chart(version, *chart_key(chart, params), _summaries=summaries)
 
-    current_jobs_data['min_salary'] = pd.to_numeric(current_jobs_data['min_salary'], errors='coerce')
-    current_jobs_data['max_salary'] = pd.to_numeric(current_jobs_data['max_salary'], errors='coerce')
 
-    # You can choose to either drop NaN values or fill them with a default value (like 0)
-    # To drop NaN values:
-    current_jobs_data = current_jobs_data.dropna(subset=['min_salary', 'max_salary'])
+def analytics_tab():
+    st.subheader("Data Analytics")
 
-    # H1B Data Analysis
-    if not h1b_data.empty:
-        st.subheader("H1B Jobs Salary Distribution")
-        plt.figure(figsize=(10, 6))
-        sns.histplot(h1b_data['BASE SALARY'], kde=True)
-        plt.xlabel("Base Salary")
-        plt.ylabel("Frequency")
-        st.pyplot(plt)
-
-        # 2. Top Employers in H1B Jobs
-        st.subheader("Top Employers in H1B Jobs")
-        top_employers = h1b_data['EMPLOYER'].value_counts().head(10)
-        plt.figure(figsize=(10, 6))
-        sns.barplot(x=top_employers.values, y=top_employers.index)
-        plt.xlabel("Number of Jobs")
-        plt.ylabel("Employers")
-        st.pyplot(plt)
-
-        # 3. Job Distribution by Year
-        st.subheader("Job Distribution by Year (H1B Jobs)")
-        jobs_by_year = h1b_data['Year'].value_counts().sort_index()
-        plt.figure(figsize=(10, 6))
-        sns.lineplot(x=jobs_by_year.index, y=jobs_by_year.values)
-        plt.xlabel("Year")
-        plt.ylabel("Number of Jobs")
-        st.pyplot(plt)
-
-        # 4. Job Titles Pie Chart
-        st.subheader("Job Titles Distribution (H1B Jobs)")
-        top_titles = h1b_data['JOB TITLE'].value_counts().head(5)
-        plt.figure(figsize=(8, 8))
-        plt.pie(top_titles, labels=top_titles.index, autopct='%1.1f%%')
-        plt.title("Top 5 Job Titles")
-        st.pyplot(plt)
-
-    # Current Jobs Data Analysis
-    if not current_jobs_data.empty:
-        # 7. Technology Frequency
-        # Assuming 'Tech' field contains comma-separated values
-        tech_series = current_jobs_data['tech'].dropna().str.split(',').explode()
-        tech_count = tech_series.value_counts().head(10)
-        st.subheader("Technology Frequency (Current Jobs)")
-        plt.figure(figsize=(10, 6))
-        sns.barplot(x=tech_count.values, y=tech_count.index)
-        plt.xlabel("Frequency")
-        plt.ylabel("Technology")
-        st.pyplot(plt)
-
-        # 9. Company-wise Job Distribution
-        st.subheader("Company-wise Job Distribution (Current Jobs)")
-        company_job_dist = current_jobs_data['employer'].value_counts().head(10)
-        plt.figure(figsize=(10, 6))
-        sns.barplot(x=company_job_dist.values, y=company_job_dist.index)
-        plt.xlabel("Number of Jobs")
-        plt.ylabel("Company")
-        st.pyplot(plt)
-
-        # 10. Location-based Job Distribution
-        st.subheader("Location-based Job Distribution (Current Jobs)")
-        location_job_dist = current_jobs_data['location'].value_counts().head(10)
-        plt.figure(figsize=(10, 6))
-        sns.barplot(x=location_job_dist.values, y=location_job_dist.index)
-        plt.xlabel("Number of Jobs")
-        plt.ylabel("Location")
-        st.pyplot(plt)
-
-        if not h1b_data.empty and not current_jobs_data.empty:
-            st.subheader("Average Base Salary Comparison")
-            avg_salary_h1b = h1b_data['BASE SALARY'].mean()
-            avg_salary_current = current_jobs_data[['min_salary', 'max_salary']].astype(float).mean(axis=1).mean()
-
-            plt.figure(figsize=(10, 6))
-            sns.barplot(x=['H1B Jobs', 'Current Jobs'], y=[avg_salary_h1b, avg_salary_current])
-            plt.ylabel('Average Salary')
-            st.pyplot(plt)
-
-            # Salary Distribution for Current Jobs
-            st.subheader("Salary Distribution (Current Jobs)")
-            current_jobs_salaries = current_jobs_data[['min_salary', 'max_salary']].astype(float).mean(axis=1)
-            plt.figure(figsize=(10, 6))
-            sns.histplot(current_jobs_salaries, kde=True)
-            plt.xlabel("Average Salary")
-            plt.ylabel("Frequency")
-            st.pyplot(plt)
-
-            # Salary by Location (For either dataset if location data is consistent)
-            st.subheader("Salary by Location")
-            # Example for H1B data; replace with current_jobs_data if needed
-            location_salary = h1b_data.groupby('LOCATION')['BASE SALARY'].mean().sort_values(ascending=False).head(10)
-            plt.figure(figsize=(10, 6))
-            sns.barplot(x=location_salary.values, y=location_salary.index)
-            plt.xlabel("Average Salary")
-            plt.ylabel("Location")
-            st.pyplot(plt)
-
-            # Tech-wise Salary Distribution (If applicable for current_jobs)
-            if 'tech' in current_jobs_data.columns:
-                st.subheader("Tech-wise Salary Distribution")
-                tech_salary = current_jobs_data.dropna(subset=['tech'])
-                tech_salary['average_salary'] = tech_salary[['min_salary', 'max_salary']].astype(float).mean(axis=1)
-                tech_salary = tech_salary.explode('tech').groupby('tech')['average_salary'].mean().sort_values(ascending=False).head(10)
-                plt.figure(figsize=(10, 6))
-                sns.barplot(x=tech_salary.values, y=tech_salary.index)
-                plt.xlabel("Average Salary")
-                plt.ylabel("Technology")
-                st.pyplot(plt)
+    # Every chart renders from the summaries precomputed by data_processing/process_data.py
+    summaries = load_summaries()
+    if summaries is None:
+        st.warning("No analytics summaries found. Run data_processing/process_data.py to build them.")
+        return
+    version = summaries_version()
+    for title, chart, params in analytics_charts(summaries['rollup']):
+        st.subheader(title)
+        st.image(render_chart(version, *chart_key(chart, params), _summaries=summaries))
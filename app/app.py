@@ -1,9 +1,54 @@
-from flask import Flask, render_template, request
+from flask import Flask, render_template, request, jsonify, g
+import os
+import re
+import queue
 import sqlite3
+import numpy as np
 import pandas as pd
-from scrape import H1B_Scraper  # Replace with the actual name of your scraper script
+from scrape.h1b.scrape_h1b import H1B_Scraper
 
-app = Flask(__name__)
+app = Flask(__name__, template_folder=os.path.join(os.path.dirname(__file__), '..', 'templates'))
+app.config.setdefault('DATABASE', 'h1b_data.db')
+
+# Rows returned per page of search results
+PAGE_SIZE = 50
+
+# Idle connections kept for reuse between requests
+POOL_SIZE = 16
+
+# Columns of h1b_jobs in the order the results page shows them
+COLUMNS = ['EMPLOYER', 'JOB TITLE', 'BASE SALARY', 'LOCATION', 'SUBMIT DATE', 'START DATE', 'Year']
+
+# Column types of h1b_jobs
+SCHEMA = {'EMPLOYER': 'TEXT', 'JOB TITLE': 'TEXT', 'BASE SALARY': 'INTEGER', 'LOCATION': 'TEXT',
+          'SUBMIT DATE': 'TEXT', 'START DATE': 'TEXT', 'Year': 'INTEGER'}
+
+# Natural key of a petition; loading a petition again updates it instead of adding a row
+KEY_COLUMNS = ['EMPLOYER', 'JOB TITLE', 'LOCATION', 'SUBMIT DATE', 'Year']
+
+# The key as indexed; a unique index treats every NULL as distinct, so missing values
+# are keyed as '' to match a petition without a location or date on every load
+KEY_EXPRESSIONS = ', '.join(f"""COALESCE("{column}", '')""" for column in KEY_COLUMNS)
+KEY_INDEX_SQL = f'CREATE UNIQUE INDEX idx_h1b_jobs_key ON h1b_jobs ({KEY_EXPRESSIONS})'
+
+# B-tree indexes of h1b_jobs; the year index also serves year and salary filters together
+INDEXES = {
+    'idx_h1b_jobs_employer': ['EMPLOYER'],
+    'idx_h1b_jobs_year_salary': ['Year', 'BASE SALARY'],
+    'idx_h1b_jobs_salary': ['BASE SALARY'],
+}
+
+# Rows per executemany batch of the loader
+CHUNK_ROWS = 50_000
+
+# Settings of the loader's connection: WAL lets searches read during a load, and a
+# single transaction only needs the log synced at commit
+LOAD_PRAGMAS = [
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -262144',
+]
 
 @app.cli.command("scrape")
 def initialize_database():
@@ -17,26 +62,279 @@ def initialize_database():
     except Exception as e:
         print(f"Error initializing database: {e}")
 
-def load_data_into_database(data):
-    conn = sqlite3.connect('h1b_data.db')
-    data.to_sql('h1b_jobs', conn, if_exists='replace', index=False)
-    conn.close()
+def quoted(columns):
+    return ', '.join(f'"{column}"' for column in columns)
+
+def create_search_indexes(conn, after_rowid=0):
+    """
+    Builds the B-tree indexes of h1b_jobs and the full-text index of its job titles.
+    The full-text table is contentless: it holds only the index, and searches join back
+    to h1b_jobs by rowid.
+    @param conn: Database connection.
+    @param after_rowid: Rows up to this rowid are already in the full-text index, or 0 to
+    rebuild it. Titles are part of the key, so indexed rows never change their title.
+    """
+    for name, columns in INDEXES.items():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON h1b_jobs ({quoted(columns)})')
+    if not after_rowid:
+        conn.execute('DROP TABLE IF EXISTS h1b_jobs_fts')
+        conn.execute("CREATE VIRTUAL TABLE h1b_jobs_fts USING fts5(job_title, content='')")
+    # In rowid order: the key index also covers the titles, and FTS5 builds far slower from
+    # the shuffled rowids of a scan over it
+    conn.execute('INSERT INTO h1b_jobs_fts (rowid, job_title) SELECT rowid, "JOB TITLE" FROM h1b_jobs '
+                 'WHERE rowid > ? ORDER BY rowid', (after_rowid,))
+    # Full statistics after a rebuild; later loads only refresh them when they went stale
+    conn.execute('PRAGMA optimize' if after_rowid else 'ANALYZE')
+
+def create_table(conn):
+    columns = ', '.join(f'"{column}" {column_type}' for column, column_type in SCHEMA.items())
+    conn.execute(f'CREATE TABLE IF NOT EXISTS h1b_jobs ({columns})')
+
+def has_key_index(conn):
+    """
+    @param conn: Database connection.
+    @return: Whether h1b_jobs has the unique key index. An index on the bare key columns,
+    which let petitions with missing values repeat, is dropped to be rebuilt.
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'idx_h1b_jobs_key'").fetchone()
+    if row is not None and row[0] != KEY_INDEX_SQL:
+        conn.execute('DROP INDEX idx_h1b_jobs_key')
+        return False
+    return row is not None
+
+def create_key_index(conn, dedupe=True):
+    """
+    Creates the unique index on the natural key.
+    @param conn: Database connection.
+    @param dedupe: Whether to first delete repeated petitions, keeping the last copy.
+    """
+    if dedupe:
+        conn.execute(f'DELETE FROM h1b_jobs WHERE rowid NOT IN '
+                     f'(SELECT MAX(rowid) FROM h1b_jobs GROUP BY {KEY_EXPRESSIONS})')
+    conn.execute(KEY_INDEX_SQL)
+
+def database_rows(chunk):
+    """
+    @param chunk: DataFrame of petitions.
+    @return: List of row tuples in SCHEMA order, with dates as text and None for missing values.
+    """
+    chunk = chunk.reindex(columns=list(SCHEMA))
+    columns = []
+    for column in chunk.columns:
+        values = chunk[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            # Dates repeat, so each distinct one is formatted once; missing dates keep code -1
+            codes, uniques = pd.factorize(values)
+            text = np.append(uniques.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object), None)
+            columns.append(text[codes].tolist())
+        else:
+            columns.append(values.astype(object).where(values.notna(), None).tolist())
+    return list(zip(*columns))
+
+def load_data_into_database(data, db_path=None):
+    """
+    Loads petitions into h1b_jobs in chunks within one transaction. Petitions already in
+    the table, by their natural key, are updated in place and new ones are added, so a
+    re-scrape only adds what is new. Missing key values match each other, like in the
+    key index.
+    The search indexes are built after a first load and extended after later ones.
+    @param data: DataFrame of petitions with the columns of SCHEMA.
+    @param db_path: Path of the database file, by default the app's DATABASE.
+    """
+    conn = sqlite3.connect(db_path or app.config['DATABASE'], isolation_level=None)
+    try:
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute('BEGIN')
+        keyed = has_key_index(conn)
+        create_table(conn)
+        last_rowid = conn.execute('SELECT COALESCE(MAX(rowid), 0) FROM h1b_jobs').fetchone()[0]
+
+        if not keyed and not last_rowid:
+            # Nothing to merge with yet, so repeated petitions are dropped before loading
+            key = data.reindex(columns=KEY_COLUMNS).astype(object)
+            data = data[~key.where(key.notna(), '').duplicated(keep='last')]
+
+        insert = f'INSERT INTO h1b_jobs ({quoted(SCHEMA)}) VALUES ({", ".join("?" * len(SCHEMA))})'
+        if keyed:
+            updates = [column for column in SCHEMA if column not in KEY_COLUMNS]
+            changed = ' OR '.join(f'excluded."{column}" IS NOT h1b_jobs."{column}"' for column in updates)
+            insert += (f' ON CONFLICT ({KEY_EXPRESSIONS}) DO UPDATE SET '
+                       + ', '.join(f'"{column}" = excluded."{column}"' for column in updates)
+                       # Unchanged petitions are left alone, so reloading them writes nothing
+                       + f' WHERE {changed}')
+        for start in range(0, len(data), CHUNK_ROWS):
+            conn.executemany(insert, database_rows(data.iloc[start:start + CHUNK_ROWS]))
+
+        if not keyed:
+            # On a first load, or a table written before the key, rows are appended and the
+            # key index is built once afterwards, far faster than maintaining it per row
+            create_key_index(conn, dedupe=bool(last_rowid))
+        create_search_indexes(conn, last_rowid if keyed else 0)
+        conn.execute('COMMIT')
+    except Exception:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+
+class ConnectionPool:
+    """
+    Reusable SQLite connections. A request thread takes one for the duration of the
+    request and returns it afterwards, so connections are shared between threads but
+    never used by two at once.
+    """
+
+    def __init__(self, db_path, size=POOL_SIZE):
+        """
+        @param db_path: Path of the database file.
+        @param size: Maximum number of idle connections kept.
+        """
+        self.db_path = db_path
+        self.idle = queue.LifoQueue(maxsize=size)
+
+    def get(self):
+        """@return: An idle connection, or a new one when none is left."""
+        try:
+            return self.idle.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            return conn
+
+    def put(self, conn):
+        """Returns a connection to the pool, closing it when the pool is full."""
+        try:
+            self.idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def get_pool():
+    pool = app.extensions.get('h1b_pool')
+    if pool is None or pool.db_path != app.config['DATABASE']:
+        pool = app.extensions['h1b_pool'] = ConnectionPool(app.config['DATABASE'])
+    return pool
+
+def get_connection():
+    """@return: The connection of the current request, taken from the pool on first use."""
+    if 'db' not in g:
+        g.db = get_pool().get()
+    return g.db
+
+@app.teardown_appcontext
+def release_connection(exception):
+    conn = g.pop('db', None)
+    if conn is not None:
+        get_pool().put(conn)
+
+def match_query(text, prefix=False):
+    """
+    @param text: Search text.
+    @param prefix: Whether the last word matches as a prefix, so a partly typed word such as
+    "soft" finds SOFTWARE.
+    @return: FTS5 query matching titles that contain every word of the text, or None when
+    the text has no words. A word ending in * matches as a prefix, which is much slower for
+    common words.
+    """
+    words = re.findall(r'(\w+)(\*?)', text)
+    if words and prefix:
+        words[-1] = (words[-1][0], '*')
+    return ' '.join(f'"{word}"{star}' for word, star in words) or None
+
+def search_jobs(conn, job_title='', employer='', year=None, min_salary=None, max_salary=None, after=None,
+                limit=PAGE_SIZE, prefix=None):
+    """
+    Searches h1b_jobs, one page at a time in rowid order.
+    @param conn: Database connection.
+    @param job_title: Words the job title must contain, ignoring case; the last word may be
+    the start of a word.
+    @param employer: Start of the employer name, ignoring case. Unlike the dashboards' contains
+    filter it is a prefix, so it is a range on the employer index; h1bdata lists names in
+    upper case, which is how they are stored.
+    @param year: Year of the petitions, or None.
+    @param min_salary: Inclusive lower bound of the base salary, or None.
+    @param max_salary: Inclusive upper bound of the base salary, or None.
+    @param after: rowid of the last row of the previous page, or None for the first page.
+    @param limit: Maximum number of rows to return.
+    @param prefix: Whether the last word of job_title matches as a prefix, or None to match it
+    as a prefix only when no title contains it in full. Whole words keep common titles fast,
+    and a page after one with rows always has rows, so every page uses the same query.
+    @return: Tuple of the rows and the rowid to pass as after for the next page, or None
+    on the last page.
+    """
+    conditions, params = [], []
+    match = match_query(job_title, prefix=bool(prefix))
+    if match:
+        # Driven by the full-text index in rowid order, so a page stops after its rows
+        source, key = "h1b_jobs_fts f JOIN h1b_jobs j ON j.rowid = f.rowid", "f.rowid"
+        conditions.append("h1b_jobs_fts MATCH ?")
+        params.append(match)
+    else:
+        source, key = "h1b_jobs j", "j.rowid"
+    if employer:
+        # A range on the employer index; names are stored in upper case
+        prefix = employer.upper()
+        conditions.append("j.EMPLOYER >= ? AND j.EMPLOYER < ?")
+        params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+    if year is not None:
+        conditions.append("j.Year = ?")
+        params.append(year)
+    if min_salary is not None:
+        conditions.append('j."BASE SALARY" >= ?')
+        params.append(min_salary)
+    if max_salary is not None:
+        conditions.append('j."BASE SALARY" <= ?')
+        params.append(max_salary)
+    if after is not None:
+        # Keyset pagination: continue after the last row instead of skipping with OFFSET
+        conditions.append(f"{key} > ?")
+        params.append(after)
+
+    where = (' WHERE ' + ' AND '.join(conditions)) if conditions else ''
+    column_list = ', '.join(f'j."{column}"' for column in COLUMNS)
+    query = f"SELECT {column_list}, j.rowid AS id FROM {source}{where} ORDER BY {key} LIMIT ?"
+    # One extra row tells whether there is a next page
+    rows = conn.execute(query, params + [limit + 1]).fetchall()
+    next_after = rows[limit - 1]['id'] if len(rows) > limit else None
+    if not rows and prefix is None and match != match_query(job_title, prefix=True):
+        return search_jobs(conn, job_title, employer, year, min_salary, max_salary, after, limit, prefix=True)
+    return rows[:limit], next_after
+
+def search_params():
+    """@return: Search arguments from the query string or form; invalid numbers are ignored."""
+    return dict(
+        job_title=request.values.get('job_title', ''),
+        employer=request.values.get('employer', ''),
+        year=request.values.get('year', type=int),
+        min_salary=request.values.get('min_salary', type=int),
+        max_salary=request.values.get('max_salary', type=int),
+        after=request.values.get('after', type=int),
+    )
 
 @app.route('/')
 def home():
     return render_template('index.html')
 
-@app.route('/search', methods=['POST'])
+@app.route('/search', methods=['GET', 'POST'])
 def search():
-    job_title = request.form['job_title']
-    conn = sqlite3.connect('h1b_data.db')
-    cursor = conn.cursor()
-    query = "SELECT * FROM h1b_jobs WHERE `JOB TITLE` LIKE ? LIMIT 50"
-    parameters = ('%' + job_title + '%',)
-    cursor.execute(query, parameters)
-    jobs = cursor.fetchall()
-    conn.close()
-    return render_template('search_results.html', jobs=jobs)
+    params = search_params()
+    jobs, next_after = search_jobs(get_connection(), **params)
+    next_params = {key: value for key, value in params.items() if value not in (None, '')}
+    next_params['after'] = next_after
+    return render_template('search_results.html', jobs=jobs, next_params=next_params if next_after else None)
+
+@app.route('/api/search')
+def api_search():
+    """
+    Searches the H1B petitions as JSON. Takes the same query parameters as the search form:
+    job_title (every word, the last one as a prefix when no title has it in full), employer (start of the name, not
+    contained anywhere), year, min_salary, max_salary, and after from next_after for the
+    next page.
+    @return: JSON with the jobs of the page and next_after, null on the last page.
+    """
+    jobs, next_after = search_jobs(get_connection(), **search_params())
+    return jsonify(jobs=[dict(job) for job in jobs], next_after=next_after)
 
 if __name__ == '__main__':
     app.run(debug=True)
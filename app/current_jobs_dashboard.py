@@ -1,19 +1,46 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from data_loader import current_jobs_source
+from paginated_view import paginated_view
 
-def main_dashboard():
-    st.subheader("Current Jobs Dashboard")
+# Renaming columns for display
+RENAME_DICT = {
+    'employer': 'Employer',
+    'job_title': 'Job Title',
+    'location': 'Location',
+    'tech': 'Technology',
+    'job_type': 'Job Type',
+    'min_salary': 'Min Salary',
+    'max_salary': 'Max Salary',
+    'h1b_sponsor': 'H1B Sponsor',
+    'h1b_petitions': 'H1B Petitions',
+    'h1b_median_salary': 'H1B Median Salary',
+    'h1b_last_year': 'Last H1B Year'
+}
+
+# Columns the results can be sorted by, all indexed in the dashboard database
+SORT_COLUMNS = {column: RENAME_DICT[column] for column in
+                ['employer', 'job_title', 'location', 'min_salary', 'max_salary']}
 
-    # Load data from CSV file
+REPLACE_VALUES = ['None', 'Null', 'NaN', 'Not Applicable']
 
-    df = pd.read_csv("data_processing/processed_aggregated_data.csv")
-    if 'Unnamed: 0.2' in df.columns:
-        df = df.drop(columns=['Unnamed: 0.2'])
 
-    # Convert 'min_salary' and 'max_salary' to numeric types, handling non-numeric values
-    df['min_salary'] = pd.to_numeric(df['min_salary'], errors='coerce')
-    df['max_salary'] = pd.to_numeric(df['max_salary'], errors='coerce')
+def display_page(df):
+    """
+    Formats one page of postings for display. Only the visible page is formatted, and the
+    loaded DataFrame is shared, so a new one is built instead of editing in place.
+    @param df: Page of job postings.
+    @return: DataFrame with display column names and 'N/A' for missing values.
+    """
+    df = df.rename(columns=RENAME_DICT)
+    return df.astype(object).mask(df.isna() | df.isin(REPLACE_VALUES), 'N/A')
+
+def main_dashboard():
+    st.subheader("Current Jobs Dashboard")
+
+    # The dashboard database, or the in-memory indexes when it has not been built
+    source = current_jobs_source()
 
     col1, col2 = st.columns(2)
     col3, col4 = st.columns(2)
@@ -38,55 +65,31 @@ def main_dashboard():
     with col8:
         h1b_sponsorship = st.checkbox("Filter by H1B Sponsorship", key='h1b_sponsorship_filter')
 
-    # Filtering logic using Pandas
+    # Filters are (column, operation, arguments) and run inside the data source
+    filters = []
     if company:
-        df = df[df['employer'].str.contains(company, case=False, na=False)]
+        filters.append(('employer', 'contains', company))
     if job_title:
-        df = df[df['job_title'].str.contains(job_title, case=False, na=False)]
+        filters.append(('job_title', 'contains', job_title))
     if location:
-        df = df[df['location'].str.contains(location, case=False, na=False)]
+        filters.append(('location', 'contains', location))
     if min_salary > 0:
-        df = df[df['min_salary'] >= min_salary]
+        filters.append(('min_salary', 'between', min_salary, None))
     if max_salary > 0:
-        df = df[df['max_salary'] <= max_salary]
+        filters.append(('max_salary', 'between', None, max_salary))
     if job_type:
-        df = df[df['job_type'].str.contains(job_type, case=False, na=False)]
+        filters.append(('job_type', 'contains', job_type))
     if tech_filter:
         tech_list = [tech.strip().lower() for tech in tech_filter.split(',')]
-        df = df[df['tech'].apply(lambda x: any(tech in str(x).lower() for tech in tech_list))]
+        filters.append(('tech', 'any_of', tech_list))
 
-    # H1B Sponsorship filtering
+    # H1B Sponsorship filtering, using the h1b_sponsor column added by data_processing/process_data.py
     if h1b_sponsorship:
-        h1b_companies = pd.read_csv("scrape/h1b/scrape_h1b.csv")
-        h1b_companies_list = h1b_companies['EMPLOYER'].dropna().str.lower().unique()
-
-        # Function to check if any H1B company name contains the employer name as a substring
-        def is_h1b_sponsor(employer):
-            employer_lower = employer.lower()
-            return any(employer_lower in h1b_company for h1b_company in h1b_companies_list)
-
-        # Filter the DataFrame
-        df['employer'] = df['employer'].astype(str)  # Ensure 'employer' is string
-        df = df[df['employer'].apply(is_h1b_sponsor)]
-
-    # Renaming columns and replacing values
-    rename_dict = {
-        'employer': 'Employer',
-        'job_title': 'Job Title',
-        'location': 'Location',
-        'tech': 'Technology',
-        'job_type': 'Job Type',
-        'min_salary': 'Min Salary',
-        'max_salary': 'Max Salary'
-    }
-    df.rename(columns=rename_dict, inplace=True)
-    replace_values = [None, 'None', 'Null', 'NaN', 'Not Applicable']
-    df.replace(replace_values, 'N/A', inplace=True)
-
-    # ignore any row which has N/A or null in employer
-    # df = df[df['Employer'] not in ['N/A', None]]
-
-    # reset th index start from 1
-    df.reset_index(drop=True, inplace=True)
+        if 'h1b_sponsor' in source.columns:
+            filters.append(('h1b_sponsor', 'is_true'))
+        else:
+            st.warning("No H1B sponsorship data. Run data_processing/process_data.py to add it.")
 
-    st.dataframe(df, width=1200, height=600)
\ No newline at end of file
+    # Only the requested page of matching rows is fetched, sorted and formatted
+    paginated_view(source, filters, key='jobs', noun='jobs', sort_columns=SORT_COLUMNS, format_page=display_page,
+                   width=1200, height=600)
@@ -3,13 +3,50 @@ import pandas as pd
 import sqlite3
 import os
 import re
+import time
+import importlib
+import threading
+
+# SQLite database written by data_processing/process_data.py
+DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'Db', 'jobs.db')
+
+# Views of the dashboard as (module, function); a view's module is imported and run only when selected
+VIEWS = {
+    "Main Dashboard": ('current_jobs_dashboard', 'main_dashboard'),
+    "H1B Job Insights": ('h1b_dashboard', 'h1b_job_insights'),
+    "Analytics": ('analytics_dashboard', 'analytics_tab'),
+}
 
 # Function to connect to your SQLite database
 def load_data(query, params=()):
-    # Adjust the database path
-    db_path = os.path.join(os.path.dirname(__file__), '..', 'Db', 'jobs.db')
-    conn = sqlite3.connect(db_path)
-    return pd.read_sql_query(query, conn, params=params)
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        return pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
+
+def warm_caches():
+    """
+    Fills the caches shared by every session behind each view, so opening a view does not
+    wait for its first data load or chart rendering.
+    """
+    from data_loader import current_jobs_source, h1b_source
+    from analytics_dashboard import warm_charts
+    for warm in (current_jobs_source, h1b_source, warm_charts):
+        started = time.perf_counter()
+        try:
+            warm()
+        except Exception as error:
+            print(f"Warming {warm.__name__} failed: {error}")
+        else:
+            print(f"Warmed {warm.__name__} in {time.perf_counter() - started:.2f}s")
+
+@st.cache_resource(show_spinner=False)
+def start_cache_warmup():
+    """Starts warming the caches in a background thread, once per process."""
+    thread = threading.Thread(target=warm_caches, name='cache-warmup', daemon=True)
+    thread.start()
+    return thread
 
 def main():
     # Logo and Title
@@ -23,20 +60,13 @@ def main():
     with col2:
         st.title('Job Insights Dashboard')
 
-    # Tabs for different dashboards
-    tab1, tab2, tab3 = st.tabs(["Main Dashboard", "H1B Job Insights", "Analytics"])
-
-    with tab1:
-        from current_jobs_dashboard import main_dashboard
-        main_dashboard()
-
-    with tab2:
-        from h1b_dashboard import h1b_job_insights
-        h1b_job_insights()
+    # Unlike st.tabs, which runs every tab on each rerun, only the selected view is computed
+    view = st.radio("View", list(VIEWS), horizontal=True, key='view', label_visibility='collapsed')
+    module, function = VIEWS[view]
+    getattr(importlib.import_module(module), function)()
 
-    with tab3:
-        from analytics_dashboard import analytics_tab
-        analytics_tab()
+    # The page is drawn, so the other views can be prepared in the background
+    start_cache_warmup()
 
 if __name__ == '__main__':
     main()
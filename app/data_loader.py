@@ -0,0 +1,197 @@
+import os
+import time
+import pandas as pd
+import streamlit as st
+from filter_index import FilterIndex
+from sql_filters import SqlTable
+from dashboard import DB_PATH, load_data
+
+PROCESSED_DATA = "data_processing/processed_aggregated_data.csv"
+H1B_DATASET = "scrape/h1b/h1b_dataset"
+
+# Columns with few distinct values are stored as categoricals
+CURRENT_JOBS_DTYPES = {
+    'employer': 'category',
+    'job_title': 'string',
+    'location': 'category',
+    'tech': 'category',
+    'job_type': 'category',
+    'source': 'category',
+    'min_salary': 'float64',
+    'max_salary': 'float64',
+    'pay_period': 'category',
+    'h1b_sponsor': 'boolean',
+    'h1b_petitions': 'Int32',
+    'h1b_median_salary': 'float64',
+    'h1b_last_year': 'Int16',
+}
+
+# Read as text and coerced, since files processed before salaries were parsed hold
+# placeholders such as 'Not Applicable'
+NUMERIC_COLUMNS = ['min_salary', 'max_salary', 'h1b_median_salary']
+
+H1B_DTYPES = {
+    'EMPLOYER': 'category',
+    'JOB TITLE': 'category',
+    # Float so missing salaries are plain NaN for the plotting libraries
+    'BASE SALARY': 'float64',
+    'LOCATION': 'category',
+    'Year': 'int16',
+}
+
+
+def file_version(path):
+    """
+    Identifies the current version of a file or dataset directory, so cached loads are
+    invalidated when the data is rewritten.
+    @param path: Path of a file or a directory of files.
+    @return: Tuple of the file count, total size and latest modification time in ns.
+    """
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        return 1, stat.st_size, stat.st_mtime_ns
+    count, size, mtime = 0, 0, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            count, size, mtime = count + 1, size + stat.st_size, max(mtime, stat.st_mtime_ns)
+    return count, size, mtime
+
+
+def read_current_jobs(path=PROCESSED_DATA):
+    """
+    Reads the processed job postings with explicit dtypes. Salaries that are not
+    numbers are read as missing.
+    @param path: Path of the processed CSV file.
+    @return: DataFrame of job postings.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {column: dtype for column, dtype in CURRENT_JOBS_DTYPES.items()
+              if column in header and column not in NUMERIC_COLUMNS}
+    data = pd.read_csv(path, usecols=[column for column in header if not column.startswith('Unnamed')],
+                       dtype=dtypes)
+    for column in NUMERIC_COLUMNS:
+        if column in data.columns:
+            data[column] = pd.to_numeric(data[column], errors='coerce').astype(CURRENT_JOBS_DTYPES[column])
+    return data
+
+
+def read_h1b(path=H1B_DATASET):
+    """
+    Reads the H1B dataset with explicit dtypes.
+    @param path: Path of the year-partitioned Parquet dataset.
+    @return: DataFrame of H1B petitions.
+    """
+    data = pd.read_parquet(path)
+    return data.astype({column: dtype for column, dtype in H1B_DTYPES.items() if column in data.columns})
+
+
+def timed_load(reader, path, name):
+    """Runs a reader and logs its load time and memory use."""
+    started = time.perf_counter()
+    data = reader(path)
+    print(f"Loaded {name}: {len(data)} rows in {time.perf_counter() - started:.2f}s, "
+          f"{data.memory_usage(deep=True).sum() / 2 ** 20:.1f} MB")
+    return data
+
+
+@st.cache_resource(max_entries=1, show_spinner="Loading job postings...")
+def cached_current_jobs(path, version):
+    return timed_load(read_current_jobs, path, 'current jobs')
+
+
+@st.cache_resource(max_entries=1, show_spinner="Loading H1B data...")
+def cached_h1b(path, version):
+    return timed_load(read_h1b, path, 'H1B data')
+
+
+@st.cache_resource(max_entries=1, show_spinner="Indexing job postings...")
+def cached_current_jobs_index(path, version):
+    return FilterIndex(cached_current_jobs(path, version),
+                       text_columns=['employer', 'job_title', 'location', 'job_type'],
+                       range_columns=['min_salary', 'max_salary'], list_columns=['tech'])
+
+
+@st.cache_resource(max_entries=1, show_spinner="Indexing H1B data...")
+def cached_h1b_index(path, version):
+    return FilterIndex(cached_h1b(path, version),
+                       text_columns=['EMPLOYER', 'JOB TITLE', 'LOCATION', 'Year'], range_columns=['BASE SALARY'])
+
+
+def load_current_jobs(path=PROCESSED_DATA):
+    """
+    Loads the processed job postings once per process and again only when the file changes.
+    The DataFrame is shared between sessions and tabs, so callers must not modify it in place.
+    @param path: Path of the processed CSV file.
+    @return: DataFrame of job postings.
+    """
+    return cached_current_jobs(path, file_version(path))
+
+
+def load_h1b(path=H1B_DATASET):
+    """
+    Loads the H1B dataset once per process and again only when a partition changes.
+    The DataFrame is shared between sessions and tabs, so callers must not modify it in place.
+    @param path: Path of the year-partitioned Parquet dataset.
+    @return: DataFrame of H1B petitions.
+    """
+    return cached_h1b(path, file_version(path))
+
+
+def load_current_jobs_index(path=PROCESSED_DATA):
+    """
+    @param path: Path of the processed CSV file.
+    @return: FilterIndex over the job postings, built once per version of the file.
+    """
+    return cached_current_jobs_index(path, file_version(path))
+
+
+def load_h1b_index(path=H1B_DATASET):
+    """
+    @param path: Path of the year-partitioned Parquet dataset.
+    @return: FilterIndex over the H1B petitions, built once per version of the dataset.
+    """
+    return cached_h1b_index(path, file_version(path))
+
+
+def current_jobs_source():
+    """
+    @return: The current_jobs table of the dashboard database when it has been built,
+    otherwise the in-memory FilterIndex over the processed CSV. Both answer the same filters.
+    """
+    table = SqlTable('current_jobs')
+    return table if table.exists() else load_current_jobs_index()
+
+
+def h1b_source():
+    """
+    @return: The h1b table of the dashboard database when it has been built, otherwise
+    the in-memory FilterIndex over the H1B dataset. Both answer the same filters.
+    """
+    table = SqlTable('h1b')
+    return table if table.exists() else load_h1b_index()
+
+
+@st.cache_resource(max_entries=1, show_spinner="Loading analytics summaries...")
+def cached_summaries(path, version):
+    return {
+        'rollup': load_data("SELECT * FROM rollup WHERE year IS NULL"),
+        'salary_histogram': load_data("SELECT * FROM salary_histogram ORDER BY dataset, bin_left"),
+    }
+
+
+def summaries_version():
+    """@return: Version of the dashboard database, which keys every cache built from its summaries."""
+    return file_version(DB_PATH)
+
+
+def load_summaries():
+    """
+    Loads the all-years rollup and the salary histograms precomputed by
+    data_processing/process_data.py, once per version of the dashboard database.
+    @return: Dict with the 'rollup' and 'salary_histogram' DataFrames, or None if the
+    summaries have not been built.
+    """
+    if not SqlTable('rollup').exists():
+        return None
+    return cached_summaries(DB_PATH, summaries_version())
@@ -0,0 +1,207 @@
+import re
+import numpy as np
+import pandas as pd
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+class TextIndex:
+    """
+    Case-insensitive substring search over one text column.
+
+    Rows hold codes into the column's distinct lowercase values, and a token inverted
+    index maps each word to the values containing it. Every word of a query is a
+    substring of some word of a matching value, so the index narrows the values to
+    check before the exact substring test, and rows are then selected by their codes.
+    """
+
+    def __init__(self, series):
+        """
+        @param series: Column to index.
+        """
+        codes, uniques = pd.factorize(series)
+        lower_codes, self.values = pd.factorize(pd.Series(uniques, dtype=object).astype(str).str.lower())
+        # Missing values keep code -1, which selects the extra False slot of a lookup table
+        self.codes = np.append(lower_codes, -1)[codes].astype(np.int32)
+
+        postings = {}
+        for code, value in enumerate(self.values):
+            for token in set(TOKEN_PATTERN.findall(value)):
+                postings.setdefault(token, []).append(code)
+        self.tokens = pd.Series(list(postings.keys()), dtype=object)
+        self.postings = [np.array(codes, dtype=np.int32) for codes in postings.values()]
+
+    def matching_values(self, text):
+        """
+        @param text: Query text.
+        @return: Array of codes of the distinct values containing the text, ignoring case.
+        """
+        text = text.lower()
+        candidates = None
+        for word in set(TOKEN_PATTERN.findall(text)):
+            hits = np.flatnonzero(self.tokens.str.contains(word, regex=False).to_numpy())
+            codes = np.unique(np.concatenate([self.postings[hit] for hit in hits] or [np.empty(0, np.int32)]))
+            candidates = codes if candidates is None else np.intersect1d(candidates, codes, assume_unique=True)
+        if candidates is None:
+            candidates = np.arange(len(self.values), dtype=np.int32)
+        found = pd.Series(self.values[candidates], dtype=object).str.contains(text, regex=False).to_numpy()
+        return candidates[found]
+
+    def contains(self, text):
+        """
+        @param text: Query text.
+        @return: Boolean row mask of the rows whose value contains the text, ignoring case.
+        """
+        lookup = np.zeros(len(self.values) + 1, dtype=bool)
+        lookup[self.matching_values(text)] = True
+        return lookup[self.codes]
+
+    def equals(self, value):
+        """
+        @param value: Exact value, compared ignoring case.
+        @return: Boolean row mask of the rows holding the value.
+        """
+        lookup = np.zeros(len(self.values) + 1, dtype=bool)
+        lookup[:-1] = self.values == str(value).lower()
+        return lookup[self.codes]
+
+
+class RangeIndex:
+    """Numeric column sorted once, so range queries are binary searches."""
+
+    def __init__(self, series):
+        """
+        @param series: Numeric column to index; missing values never match.
+        """
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        self.order = np.argsort(values, kind='stable')
+        self.sorted = values[self.order]
+        self.count = int(np.count_nonzero(~np.isnan(values)))
+
+    def between(self, low=None, high=None):
+        """
+        @param low: Inclusive lower bound, or None.
+        @param high: Inclusive upper bound, or None.
+        @return: Boolean row mask of the rows within the bounds.
+        """
+        start = 0 if low is None else np.searchsorted(self.sorted[:self.count], low, 'left')
+        end = self.count if high is None else np.searchsorted(self.sorted[:self.count], high, 'right')
+        mask = np.zeros(len(self.order), dtype=bool)
+        mask[self.order[start:end]] = True
+        return mask
+
+
+class ListIndex:
+    """Comma-separated list column, such as tech, with a packed bitmap of rows per item."""
+
+    def __init__(self, series):
+        """
+        @param series: Column of comma-separated items.
+        """
+        self.rows = len(series)
+        # Lists repeat heavily, so items are split once per distinct list and mapped back by code
+        codes, uniques = pd.factorize(series)
+        items = pd.Series(uniques, dtype=object).astype(str).str.lower().str.split(',').explode().str.strip()
+        items = items[items != '']
+        self.bitmaps = {}
+        for item, lists in pd.Series(items.index, dtype=np.int64).groupby(items.to_numpy()):
+            lookup = np.zeros(len(uniques) + 1, dtype=bool)
+            lookup[lists.to_numpy()] = True
+            self.bitmaps[item] = np.packbits(lookup[codes])
+
+    def any_of(self, queries):
+        """
+        @param queries: Query strings; an item matches when it contains one, ignoring case.
+        @return: Boolean row mask of the rows with a matching item.
+        """
+        packed = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        for item, bitmap in self.bitmaps.items():
+            if any(query in item for query in queries):
+                packed |= bitmap
+        return np.unpackbits(packed, count=self.rows).astype(bool)
+
+
+class FilterIndex:
+    """
+    Precomputed indexes over a DataFrame for the dashboard filters.
+
+    Each filter returns a boolean row mask and select() intersects them, so a rerun
+    costs a few vectorized passes instead of a string scan per filter. Sorted queries
+    read the matches off a row order computed once per column.
+    """
+
+    def __init__(self, data, text_columns=(), range_columns=(), list_columns=()):
+        """
+        @param data: DataFrame to index. It is kept and must not be modified afterwards.
+        @param text_columns: Columns searched by substring or exact value.
+        @param range_columns: Numeric columns filtered by range.
+        @param list_columns: Comma-separated list columns filtered by item.
+        """
+        self.data = data
+        self.text = {column: TextIndex(data[column]) for column in text_columns if column in data.columns}
+        self.ranges = {column: RangeIndex(data[column]) for column in range_columns if column in data.columns}
+        self.lists = {column: ListIndex(data[column]) for column in list_columns if column in data.columns}
+        self.orders = {}
+
+    @property
+    def columns(self):
+        return self.data.columns
+
+    def contains(self, column, text):
+        return self.text[column].contains(text)
+
+    def equals(self, column, value):
+        return self.text[column].equals(value)
+
+    def between(self, column, low=None, high=None):
+        return self.ranges[column].between(low, high)
+
+    def any_of(self, column, queries):
+        return self.lists[column].any_of(queries)
+
+    def is_true(self, column):
+        return self.data[column].fillna(False).to_numpy(dtype=bool)
+
+    def select(self, masks):
+        """
+        @param masks: Boolean row masks from the filter methods.
+        @return: The rows matching every mask, or the whole DataFrame when there are none.
+        """
+        if not masks:
+            return self.data
+        return self.data.iloc[np.flatnonzero(np.logical_and.reduce(masks))]
+
+    def sort_order(self, column):
+        """
+        @param column: Column to sort by.
+        @return: Row positions in ascending order of the column, built on first use. Missing
+        values sort first and ties keep row order, as with ORDER BY in the dashboard database.
+        """
+        if column not in self.orders:
+            codes, _ = pd.factorize(self.data[column], sort=True)
+            self.orders[column] = np.argsort(codes, kind='stable')
+        return self.orders[column]
+
+    def query(self, filters, limit=None, offset=0, sort_by=None, descending=False):
+        """
+        Runs filters given as data, the same way SqlTable does.
+        @param filters: List of (column, op, *args) filters, where op names a filter method.
+        @param limit: Maximum number of rows to return, or None for all.
+        @param offset: Number of matching rows to skip.
+        @param sort_by: Column to sort the matches by, or None for row order.
+        @param descending: Whether to sort in descending order.
+        @return: Tuple of the page of matching rows and the total number of matches.
+        """
+        masks = [getattr(self, op)(column, *args) for column, op, *args in filters]
+        mask = np.logical_and.reduce(masks) if masks else None
+        if sort_by is not None:
+            positions = self.sort_order(sort_by)
+            if descending:
+                positions = positions[::-1]
+            if mask is not None:
+                # Keeps the sorted order while dropping the rows that do not match
+                positions = positions[mask[positions]]
+        else:
+            positions = np.arange(len(self.data)) if mask is None else np.flatnonzero(mask)
+        end = None if limit is None else offset + limit
+        return self.data.iloc[positions[offset:end]], len(positions)
@@ -1,13 +1,16 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+from data_loader import h1b_source
+from paginated_view import paginated_view
+
+# Columns the results can be sorted by, all indexed in the dashboard database
+SORT_COLUMNS = {'EMPLOYER': 'Employer', 'JOB TITLE': 'Job Title', 'LOCATION': 'Location',
+                'BASE SALARY': 'Base Salary', 'Year': 'Year'}
 
 def h1b_job_insights():
     st.subheader("H1B Job Insights")
 
-    # Load data from CSV file
-    df = pd.read_csv("scrape/h1b/scrape_h1b.csv")
-
     col1, col2 = st.columns(2)  # First row of columns
     col3, col4 = st.columns(2)  # Second row of columns
     col5, col6 = st.columns(2)  # Third row of columns
@@ -25,22 +28,25 @@ def h1b_job_insights():
     with col6:
         year = st.selectbox("Select Year", options=["", "2020", "2021", "2022"], index=0)
 
-    # Filtering logic using Pandas
+    # The dashboard database, or the in-memory indexes when it has not been built
+    source = h1b_source()
+
+    # Filters are (column, operation, arguments) and run inside the data source
+    filters = []
+    if year:
+        filters.append(('Year', 'equals', year))
     if employer:
-        df = df[df['EMPLOYER'].str.contains(employer, case=False, na=False)]
+        filters.append(('EMPLOYER', 'contains', employer))
     if job_title:
-        df = df[df['JOB TITLE'].str.contains(job_title, case=False, na=False)]
-    if min_salary > 0:
-        df = df[df['BASE SALARY'] >= min_salary]
-    if max_salary > 0:
-        df = df[df['BASE SALARY'] <= max_salary]
+        filters.append(('JOB TITLE', 'contains', job_title))
+    if min_salary > 0 or max_salary > 0:
+        filters.append(('BASE SALARY', 'between', min_salary if min_salary > 0 else None,
+                        max_salary if max_salary > 0 else None))
     if location:
-        df = df[df['LOCATION'].str.contains(location, case=False, na=False)]
-    if year:
-        df = df[df['Year'] == year]
+        filters.append(('LOCATION', 'contains', location))
 
-    df.reset_index(drop=True, inplace=True)
-    st.dataframe(df, width=700, height=300)
+    # Only the requested page of matching rows is fetched and sorted
+    paginated_view(source, filters, key='h1b', noun='petitions', sort_columns=SORT_COLUMNS, width=700, height=300)
 
 # The main function to call our dashboard
 def main():
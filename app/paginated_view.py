@@ -0,0 +1,49 @@
+import streamlit as st
+
+# Rows shown per page of results
+PAGE_SIZE = 100
+
+
+def paginated_view(source, filters, key, noun, sort_columns, format_page=None, page_size=PAGE_SIZE,
+                   **dataframe_args):
+    """
+    Shows one page of the rows matching the filters, with sort and page controls.
+
+    Only the visible page is read from the source, formatted and sent to the browser,
+    and sorting follows the source's precomputed order for the column, so the cost of a
+    rerun does not grow with the number of matches.
+    @param source: SqlTable or FilterIndex to query.
+    @param filters: List of (column, op, *args) filters.
+    @param key: Widget key prefix, unique per tab.
+    @param noun: Name of the rows in the caption, such as "jobs".
+    @param sort_columns: Dict of sortable column to its label.
+    @param format_page: Function formatting the page for display, or None.
+    @param page_size: Rows per page.
+    @param dataframe_args: Arguments passed on to st.dataframe.
+    """
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        options = [None] + [column for column in sort_columns if column in source.columns]
+        sort_by = st.selectbox("Sort by", options=options, key=f'{key}_sort',
+                               format_func=lambda column: "Default" if column is None else sort_columns[column])
+    with col2:
+        descending = st.radio("Order", ["Ascending", "Descending"], horizontal=True,
+                              key=f'{key}_order') == "Descending"
+
+    # A new query starts again from the first page
+    query = repr((filters, sort_by, descending))
+    if st.session_state.get(f'{key}_query') != query:
+        st.session_state[f'{key}_query'] = query
+        st.session_state[f'{key}_page'] = 1
+    with col3:
+        page = st.number_input("Page", min_value=1, step=1, key=f'{key}_page')
+
+    offset = (page - 1) * page_size
+    df, total = source.query(filters, limit=page_size, offset=offset, sort_by=sort_by, descending=descending)
+    pages = max(1, -(-total // page_size))
+    shown = f"{offset + 1}-{offset + len(df)}" if len(df) else "none"
+    st.caption(f"Showing {shown} of {total} {noun} (page {page} of {pages})")
+
+    if format_page is not None:
+        df = format_page(df)
+    st.dataframe(df.reset_index(drop=True), **dataframe_args)
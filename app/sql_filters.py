@@ -0,0 +1,96 @@
+import os
+from dashboard import DB_PATH, load_data
+
+# Escape character for LIKE patterns, so user input with % or _ matches literally
+LIKE_ESCAPE = '\\'
+
+
+def like_pattern(text):
+    """
+    @param text: Text to search for.
+    @return: LIKE pattern matching values that contain the text.
+    """
+    escaped = text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace('%', LIKE_ESCAPE + '%').replace('_', LIKE_ESCAPE + '_')
+    return f"%{escaped}%"
+
+
+def compile_filter(column, op, *args):
+    """
+    Compiles one dashboard filter into a SQL condition.
+    @param column: Column name.
+    @param op: 'contains', 'equals', 'between', 'any_of' or 'is_true', as in FilterIndex.
+    @param args: The filter's arguments.
+    @return: Tuple of the condition and its parameters.
+    """
+    quoted = f'"{column}"'
+    if op == 'contains':
+        # LIKE ignores ASCII case in SQLite, like the case-insensitive pandas filters
+        return f"{quoted} LIKE ? ESCAPE '{LIKE_ESCAPE}'", [like_pattern(args[0])]
+    if op == 'equals':
+        return f"{quoted} = ?", [args[0]]
+    if op == 'between':
+        low, high = (list(args) + [None, None])[:2]
+        conditions = ([f"{quoted} >= ?"] if low is not None else []) + ([f"{quoted} <= ?"] if high is not None else [])
+        return ' AND '.join(conditions) or '1', [value for value in (low, high) if value is not None]
+    if op == 'any_of':
+        conditions = [f"{quoted} LIKE ? ESCAPE '{LIKE_ESCAPE}'" for _ in args[0]]
+        return '(' + ' OR '.join(conditions or ['0']) + ')', [like_pattern(query) for query in args[0]]
+    if op == 'is_true':
+        return f"{quoted} = 1", []
+    raise ValueError(f"Unknown filter operation: {op}")
+
+
+def compile_filters(filters):
+    """
+    @param filters: List of (column, op, *args) filters.
+    @return: Tuple of a WHERE clause (empty when there are no filters) and its parameters.
+    """
+    conditions, params = [], []
+    for column, op, *args in filters:
+        condition, condition_params = compile_filter(column, op, *args)
+        conditions.append(condition)
+        params.extend(condition_params)
+    return (' WHERE ' + ' AND '.join(conditions)) if conditions else '', params
+
+
+class SqlTable:
+    """
+    A table in the dashboard database, queried with the same filters as FilterIndex.
+    Filters run inside SQLite and only the requested page of rows is read into pandas.
+    """
+
+    def __init__(self, table):
+        """
+        @param table: Table name.
+        """
+        self.table = table
+
+    def query(self, filters, limit=None, offset=0, sort_by=None, descending=False):
+        """
+        @param filters: List of (column, op, *args) filters.
+        @param limit: Maximum number of rows to return, or None for all.
+        @param offset: Number of matching rows to skip.
+        @param sort_by: Column to sort the matches by, or None for row order.
+        @param descending: Whether to sort in descending order.
+        @return: Tuple of the page of matching rows and the total number of matches.
+        """
+        where, params = compile_filters(filters)
+        total = int(load_data(f"SELECT COUNT(*) AS total FROM {self.table}{where}", params)['total'].iloc[0])
+        # Sorting on an indexed column with rowid as the tiebreak walks the column's index,
+        # forwards or backwards, and stops after the page
+        direction = ' DESC' if descending else ''
+        order = f'"{sort_by}"{direction}, rowid{direction}' if sort_by is not None else 'rowid'
+        # LIMIT -1 means no limit in SQLite
+        rows = load_data(f"SELECT * FROM {self.table}{where} ORDER BY {order} LIMIT ? OFFSET ?",
+                         params + [-1 if limit is None else int(limit), int(offset)])
+        return rows, total
+
+    @property
+    def columns(self):
+        """@return: List of the table's column names."""
+        return load_data(f"PRAGMA table_info({self.table})")['name'].tolist()
+
+    def exists(self):
+        """@return: Whether the dashboard database exists and has the table."""
+        return os.path.exists(DB_PATH) and not load_data(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (self.table,)).empty
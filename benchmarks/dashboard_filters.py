@@ -0,0 +1,108 @@
+"""
+Compares the dashboards' pandas filters with the precomputed FilterIndex.
+
+Usage:
+    python benchmarks/dashboard_filters.py [--rows 3000000]
+
+Postings are synthetic with realistic cardinalities: many rows share each employer,
+title and location, and the tech column holds one to three comma-separated techs.
+Each query combines several filters the way the Current Jobs tab does, and both paths
+must return the same rows. The index build happens once per dataset version in the
+dashboard, so it is reported separately from the per-query times.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import numpy as np
+import pandas as pd
+from filter_index import FilterIndex
+
+TECHS = ['Python', 'Java', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'C++', 'SQL', 'Scala', 'Kotlin']
+TITLES = ['Software Engineer', 'Senior Software Engineer', 'Data Engineer', 'Data Scientist',
+          'Machine Learning Engineer', 'DevOps Engineer', 'Backend Developer', 'Frontend Developer']
+LEVELS = ['I', 'II', 'III', 'Staff', 'Principal', 'Lead']
+
+QUERIES = [
+    {'employer': 'labs 12'},
+    {'job_title': 'data', 'location': 'san'},
+    {'tech': ['python', 'go'], 'min_salary': 150000},
+    {'employer': 'systems', 'job_title': 'senior software', 'max_salary': 200000, 'tech': ['java']},
+]
+
+
+def synthetic_postings(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    employers = np.array([f"{word} Labs {i}" for i, word in enumerate(
+        rng.choice(['Acme', 'Blue River', 'Quantum', 'North Systems', 'Cloud Data'], 50_000))], dtype=object)
+    titles = np.array([f"{title} {level}" for title in TITLES for level in LEVELS] * 50, dtype=object)
+    titles = np.array([f"{title} - Team {i}" for i, title in enumerate(titles)], dtype=object)
+    cities = np.array([f"{prefix} {i}, CA" for i, prefix in enumerate(
+        rng.choice(['San', 'Santa', 'Los', 'Palo', 'Mountain'], 3000))], dtype=object)
+    tech_sets = np.array([','.join(rng.choice(TECHS, rng.integers(1, 4), replace=False)) for _ in range(500)],
+                         dtype=object)
+    low = rng.integers(50, 250, rows) * 1000.0
+    low[rng.random(rows) < 0.3] = np.nan
+    return pd.DataFrame({
+        'employer': pd.Categorical(employers[rng.integers(0, len(employers), rows)]),
+        'job_title': pd.array(titles[rng.integers(0, len(titles), rows)], dtype='string'),
+        'location': pd.Categorical(cities[rng.integers(0, len(cities), rows)]),
+        'tech': pd.Categorical(tech_sets[rng.integers(0, len(tech_sets), rows)]),
+        'min_salary': low,
+        'max_salary': low * 1.4,
+    })
+
+
+def pandas_filter(df, query):
+    """The filtering the Current Jobs tab did before the index."""
+    for column in ('employer', 'job_title', 'location'):
+        if column in query:
+            df = df[df[column].str.contains(query[column], case=False, na=False)]
+    if 'min_salary' in query:
+        df = df[df['min_salary'] >= query['min_salary']]
+    if 'max_salary' in query:
+        df = df[df['max_salary'] <= query['max_salary']]
+    if 'tech' in query:
+        df = df[df['tech'].apply(lambda x: any(tech in str(x).lower() for tech in query['tech']))]
+    return df
+
+
+def index_filter(index, query):
+    masks = [index.contains(column, query[column]) for column in ('employer', 'job_title', 'location')
+             if column in query]
+    if 'min_salary' in query:
+        masks.append(index.between('min_salary', low=query['min_salary']))
+    if 'max_salary' in query:
+        masks.append(index.between('max_salary', high=query['max_salary']))
+    if 'tech' in query:
+        masks.append(index.any_of('tech', query['tech']))
+    return index.select(masks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=3_000_000)
+    args = parser.parse_args()
+
+    data = synthetic_postings(args.rows)
+    started = time.perf_counter()
+    index = FilterIndex(data, text_columns=['employer', 'job_title', 'location'],
+                        range_columns=['min_salary', 'max_salary'], list_columns=['tech'])
+    print(f"rows: {args.rows}, index build: {time.perf_counter() - started:.2f}s (once per dataset version)")
+    print(f"{'query':<60}{'matches':>10}{'pandas ms':>12}{'index ms':>11}")
+    for query in QUERIES:
+        started = time.perf_counter()
+        expected = pandas_filter(data, query)
+        pandas_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        result = index_filter(index, query)
+        index_ms = (time.perf_counter() - started) * 1000
+        assert result.index.equals(expected.index), query
+        print(f"{str(query):<60}{len(result):>10}{pandas_ms:>12.0f}{index_ms:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
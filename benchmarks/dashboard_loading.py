@@ -0,0 +1,69 @@
+"""
+Compares the dashboards' original per-rerun data reads with the typed, cached loaders.
+
+Usage:
+    python benchmarks/dashboard_loading.py [--reruns 20]
+
+Run from the repository root after data_processing/process_data.py and the H1B
+scraper have produced their outputs. The original path is what each tab did on every
+widget interaction. The current jobs and analytics tabs each read the processed CSV
+and coerced the salaries, and the H1B and analytics tabs each read the H1B dataset, so
+one rerun did both reads twice. The typed path is timed
+for the first load, and its memory use is compared with the original frames; later
+reruns only check the file version.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import pandas as pd
+from data_loader import PROCESSED_DATA, H1B_DATASET, file_version, read_current_jobs, read_h1b
+
+
+def original_reads():
+    """The reads the tabs ran before the shared loader, once each."""
+    current_jobs = pd.read_csv(PROCESSED_DATA)
+    current_jobs['min_salary'] = pd.to_numeric(current_jobs['min_salary'], errors='coerce')
+    current_jobs['max_salary'] = pd.to_numeric(current_jobs['max_salary'], errors='coerce')
+    h1b = pd.read_parquet(H1B_DATASET) if os.path.isdir(H1B_DATASET) else pd.DataFrame()
+    return current_jobs, h1b
+
+
+def typed_reads():
+    h1b = read_h1b(H1B_DATASET) if os.path.isdir(H1B_DATASET) else pd.DataFrame()
+    return read_current_jobs(PROCESSED_DATA), h1b
+
+
+def megabytes(data):
+    return data.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+
+    original_time, (original_jobs, original_h1b) = timed(original_reads)
+    typed_time, (typed_jobs, typed_h1b) = timed(typed_reads)
+    version_time, _ = timed(lambda: [(file_version(PROCESSED_DATA), file_version(H1B_DATASET))
+                                     for _ in range(args.reruns)])
+
+    print(f"rows:                   {len(original_jobs)} current jobs, {len(original_h1b)} H1B")
+    print(f"original per rerun:     {2 * original_time:.3f}s (each dataset read twice)")
+    print(f"typed first load:       {typed_time:.3f}s")
+    print(f"typed per rerun:        {version_time / args.reruns * 1000:.2f}ms (version check only)")
+    print(f"current jobs memory:    {megabytes(original_jobs):.1f} MB -> {megabytes(typed_jobs):.1f} MB")
+    print(f"H1B memory:             {megabytes(original_h1b):.1f} MB -> {megabytes(typed_h1b):.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Compares sending every matching row to st.dataframe with the paginated view.
+
+Usage:
+    python benchmarks/dashboard_pagination.py [--rows 1000000]
+
+Postings are the synthetic ones of dashboard_filters.py. The original path is what the
+Current Jobs tab did on each rerun: filter the whole frame, replace the placeholder
+values across all of it and hand it to st.dataframe. The paginated path queries one
+sorted page from the FilterIndex and formats only that page. The payload is the Arrow
+IPC stream st.dataframe sends to the browser, with mixed object columns converted to
+strings the way Streamlit does.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from dashboard_filters import synthetic_postings
+from filter_index import FilterIndex
+from current_jobs_dashboard import REPLACE_VALUES, display_page
+from paginated_view import PAGE_SIZE
+
+QUERIES = [
+    ('no filters', []),
+    ('python or go', [('tech', 'any_of', ['python', 'go'])]),
+    ('data titles in san', [('job_title', 'contains', 'data'), ('location', 'contains', 'san')]),
+]
+
+
+def arrow_payload(df):
+    """@return: Size in bytes of the Arrow stream st.dataframe would send for the DataFrame."""
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        table = pa.Table.from_pandas(df.astype({column: str for column in df.columns if df[column].dtype == object}))
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def original_view(index, filters):
+    """The full filtered frame with the placeholders replaced everywhere, as the tab sent it."""
+    df = index.query(filters)[0]
+    return df.astype(object).replace([None] + REPLACE_VALUES, 'N/A')
+
+
+def paginated_view(index, filters):
+    """The first page sorted by maximum salary, formatted alone."""
+    df, _ = index.query(filters, limit=PAGE_SIZE, sort_by='max_salary', descending=True)
+    return display_page(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    data = synthetic_postings(args.rows)
+    index = FilterIndex(data, text_columns=['employer', 'job_title', 'location'],
+                        range_columns=['min_salary', 'max_salary'], list_columns=['tech'])
+    started = time.perf_counter()
+    index.sort_order('max_salary')
+    print(f"rows: {args.rows}, sort index build: {time.perf_counter() - started:.2f}s (once per column)")
+    print(f"{'query':<22}{'matches':>10}{'full ms':>10}{'full MB':>10}{'page ms':>10}{'page KB':>10}")
+    for name, filters in QUERIES:
+        started = time.perf_counter()
+        full = original_view(index, filters)
+        full_bytes = arrow_payload(full)
+        full_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        page = paginated_view(index, filters)
+        page_bytes = arrow_payload(page)
+        page_ms = (time.perf_counter() - started) * 1000
+        expected = data.loc[full.index, 'max_salary'].sort_values(ascending=False).head(PAGE_SIZE)
+        assert np.array_equal(pd.to_numeric(page['Max Salary'], errors='coerce').to_numpy(dtype=float),
+                              expected.to_numpy(), equal_nan=True), name
+        print(f"{name:<22}{len(full):>10}{full_ms:>10.0f}{full_bytes / 2 ** 20:>10.1f}"
+              f"{page_ms:>10.1f}{page_bytes / 2 ** 10:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
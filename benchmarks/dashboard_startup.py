@@ -0,0 +1,129 @@
+"""
+Measures the dashboard's cold start and the latency of common interactions.
+
+Usage:
+    python benchmarks/dashboard_startup.py [--reruns 5]
+
+Run from the repository root after data_processing/process_data.py has built
+Db/jobs.db. The app is driven headless through streamlit.testing.AppTest. Cold start is
+the first run of app/dashboard.py in a fresh process, once per view. It includes
+importing the view's modules and its first data loads, but not importing streamlit
+itself. The interactions run in one process after the background cache warm-up has
+finished, and report the median of several reruns. The import cost of matplotlib and
+seaborn, which only the Analytics view needs, is reported on its own.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app')
+sys.path.insert(0, APP_DIR)
+
+DASHBOARD = os.path.join(APP_DIR, 'dashboard.py')
+VIEWS = ["Main Dashboard", "H1B Job Insights", "Analytics"]
+
+
+def text_input(at, label):
+    return next(widget for widget in at.text_input if widget.label == label)
+
+
+def sort_jobs(at, i):
+    at.selectbox(key='jobs_sort').set_value('max_salary')
+    at.radio(key='jobs_order').set_value(["Ascending", "Descending"][i % 2])
+
+
+# Interactions as (name, view, action); each action changes one widget
+INTERACTIONS = [
+    ("jobs: filter by company", "Main Dashboard",
+     lambda at, i: at.text_input(key='company_filter').input(f"inc {i}")),
+    ("jobs: next page", "Main Dashboard", lambda at, i: at.number_input(key='jobs_page').set_value(i + 2)),
+    ("jobs: sort by max salary", "Main Dashboard", sort_jobs),
+    ("h1b: filter by employer", "H1B Job Insights",
+     lambda at, i: text_input(at, "Search by Employer").input(f"inc {i}")),
+    ("h1b: next page", "H1B Job Insights", lambda at, i: at.number_input(key='h1b_page').set_value(i + 2)),
+    ("switch view", None, lambda at, i: at.radio(key='view').set_value(VIEWS[i % len(VIEWS)])),
+]
+
+
+def new_app():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(DASHBOARD, default_timeout=600)
+
+
+def timed_run(at):
+    started = time.perf_counter()
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return time.perf_counter() - started
+
+
+def cold_start(view):
+    """First run of the dashboard on one view, in this process."""
+    at = new_app()
+    at.session_state['view'] = view
+    return {'view': view, 'seconds': timed_run(at)}
+
+
+def plotting_imports():
+    started = time.perf_counter()
+    import matplotlib.pyplot
+    import seaborn
+    return {'seconds': time.perf_counter() - started}
+
+
+def in_fresh_process(function, *args):
+    """@return: The result of running a function of this script in a new interpreter."""
+    output = subprocess.run([sys.executable, __file__, '--run', function, *args],
+                            capture_output=True, text=True, check=True).stdout
+    # The background warm-up may print around the result
+    return json.loads(next(line for line in output.splitlines() if line.startswith('{')))
+
+
+def interactions(reruns):
+    at = new_app()
+    timed_run(at)
+    warmup = next((thread for thread in threading.enumerate() if thread.name == 'cache-warmup'), None)
+    started = time.perf_counter()
+    if warmup is not None:
+        warmup.join()
+    print(f"background warm-up finished {time.perf_counter() - started:.2f}s after the first run")
+
+    print(f"{'interaction':<28}{'median ms':>10}{'max ms':>10}")
+    for name, view, action in INTERACTIONS:
+        if view is not None:
+            at.radio(key='view').set_value(view)
+            timed_run(at)
+        times = []
+        for i in range(reruns):
+            action(at, i)
+            times.append(timed_run(at) * 1000)
+        print(f"{name:<28}{statistics.median(times):>10.0f}{max(times):>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reruns', type=int, default=5)
+    parser.add_argument('--run', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        function, *function_args = args.run
+        print(json.dumps(globals()[function](*function_args)))
+        return
+
+    print(f"matplotlib and seaborn import: {in_fresh_process('plotting_imports')['seconds']:.2f}s "
+          "(only when Analytics is opened or warmed)")
+    print(f"{'cold start on view':<28}{'seconds':>10}")
+    for view in VIEWS:
+        print(f"{view:<28}{in_fresh_process('cold_start', view)['seconds']:>10.2f}")
+    interactions(args.reruns)
+
+
+if __name__ == '__main__':
+    main()
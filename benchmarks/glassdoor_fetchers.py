@@ -0,0 +1,94 @@
+"""
+Compares the HTTP and Selenium Glassdoor fetchers on recorded search pages.
+
+Usage:
+    python benchmarks/glassdoor_fetchers.py path/to/fixtures [--rounds 5] [--selenium] [--chromedriver PATH]
+
+The fixtures directory holds saved Glassdoor search result pages (*.html). They are
+served from a local HTTP server and every backend fetches and parses each page
+`rounds` times in its own process, so peak RSS is measured per backend. For Selenium
+the peak RSS of the largest browser process is reported alongside the Python process.
+"""
+import argparse
+import functools
+import http.server
+import multiprocessing
+import os
+import resource
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scrape'))
+
+from glassdoor.scrape_glassdoor import HttpPageFetcher, SeleniumPageFetcher, create_driver, parse_job_list
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler that does not log every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures(directory):
+    """Serves the fixtures directory on a free local port and returns the server."""
+    handler = functools.partial(QuietHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def rss_mb(kilobytes_or_bytes):
+    """Converts ru_maxrss to megabytes; it is reported in bytes on macOS and kilobytes elsewhere."""
+    return kilobytes_or_bytes / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def run_backend(backend, urls, rounds, chromedriver_path, results):
+    """Fetches and parses every URL `rounds` times and reports throughput and peak RSS."""
+    if backend == 'http':
+        fetcher = HttpPageFetcher()
+    else:
+        fetcher = SeleniumPageFetcher(lambda: create_driver(chromedriver_path))
+    jobs = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for url in urls:
+            jobs += len(parse_job_list(fetcher.fetch(url), 'benchmark') or [])
+    elapsed = time.perf_counter() - started
+    fetcher.close()
+    self_rss = rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+    child_rss = rss_mb(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    results.put((backend, len(urls) * rounds / elapsed, jobs, self_rss, child_rss))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fixtures', help="Directory of saved Glassdoor search pages")
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--selenium', action='store_true', help="Also benchmark the Selenium backend")
+    parser.add_argument('--chromedriver', default=os.getenv('CHROME_DRIVER_PATH'))
+    args = parser.parse_args()
+
+    pages = sorted(name for name in os.listdir(args.fixtures) if name.endswith('.html'))
+    if not pages:
+        sys.exit(f"No .html fixtures found in {args.fixtures}")
+    server = serve_fixtures(args.fixtures)
+    urls = [f"http://127.0.0.1:{server.server_port}/{name}" for name in pages]
+
+    backends = ['http', 'selenium'] if args.selenium else ['http']
+    results = multiprocessing.Queue()
+    print(f"{'backend':<10}{'pages/sec':>12}{'jobs':>8}{'peak RSS MB':>14}{'browser RSS MB':>16}")
+    for backend in backends:
+        process = multiprocessing.Process(
+            target=run_backend, args=(backend, urls, args.rounds, args.chromedriver, results))
+        process.start()
+        name, pages_per_sec, jobs, self_rss, child_rss = results.get()
+        process.join()
+        print(f"{name:<10}{pages_per_sec:>12.1f}{jobs:>8}{self_rss:>14.1f}{child_rss:>16.1f}")
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
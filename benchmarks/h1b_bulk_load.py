@@ -0,0 +1,77 @@
+"""
+Compares the original H1B table load with the bulk upsert loader of app/app.py.
+
+Usage:
+    python benchmarks/h1b_bulk_load.py [--rows 1000000]
+
+Petitions are the synthetic ones of h1b_search_api.py. The original load replaced the
+table with DataFrame.to_sql on every scrape and built no indexes. The bulk loader is
+timed for a first load into an empty database, including its indexes. It is then timed
+for a reload of the same petitions, and for a re-scrape that changes some salaries and
+adds new petitions. Some petitions lack a location or submit date, as when the scraped
+values can't be parsed. The table must end up with one row per petition.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pandas as pd
+from h1b_search_api import synthetic_petitions
+from app.app import KEY_COLUMNS, load_data_into_database
+
+
+def timed(label, function, *args):
+    started = time.perf_counter()
+    function(*args)
+    print(f"{label:<44}{time.perf_counter() - started:>8.1f}s")
+
+
+def original_load(data, db_path):
+    conn = sqlite3.connect(db_path)
+    data.to_sql('h1b_jobs', conn, if_exists='replace', index=False)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    data = synthetic_petitions(args.rows)
+    data.loc[rng.random(len(data)) < 0.01, 'LOCATION'] = None
+    data.loc[rng.random(len(data)) < 0.01, 'SUBMIT DATE'] = pd.NaT
+    data = data.drop_duplicates(KEY_COLUMNS, ignore_index=True)
+    rescrape = data.sample(frac=0.5, random_state=1)
+    changed = rng.random(len(rescrape)) < 0.02
+    rescrape.loc[changed, 'BASE SALARY'] += 1000
+    new = synthetic_petitions(len(data) // 50, seed=2)
+    rescrape = pd.concat([rescrape, new], ignore_index=True)
+    expected = len(pd.concat([data, new]).drop_duplicates(KEY_COLUMNS))
+
+    print(f"petitions: {len(data)}, re-scrape: {len(rescrape)} with {changed.sum()} changed salaries")
+    with tempfile.TemporaryDirectory() as directory:
+        timed("original to_sql replace, no indexes", original_load, data, os.path.join(directory, 'original.db'))
+        db_path = os.path.join(directory, 'bulk.db')
+        timed("bulk first load with indexes", load_data_into_database, data, db_path)
+        timed("bulk reload of the same petitions", load_data_into_database, data, db_path)
+        timed("bulk re-scrape", load_data_into_database, rescrape, db_path)
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute('SELECT COUNT(*) FROM h1b_jobs').fetchone()[0]
+        indexed = conn.execute("SELECT COUNT(*) FROM h1b_jobs_fts WHERE h1b_jobs_fts MATCH 'engineer'").fetchone()[0]
+        titles = conn.execute("SELECT COUNT(*) FROM h1b_jobs WHERE \"JOB TITLE\" LIKE '%engineer%'").fetchone()[0]
+        conn.close()
+        assert rows == expected, (rows, expected)
+        assert indexed == titles, (indexed, titles)
+        print(f"rows after re-scrape: {rows}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Runs H1B_Scraper.scrape against a local stub of h1bdata.info with injected latency and errors.
+
+Usage:
+    python benchmarks/h1b_fetch_stub.py [--jobs 8] [--years 3] [--rows 200] [--latency 50] [--workers 1 6]
+
+A ThreadingHTTPServer answers every (year, job) search with a synthetic results table
+after --latency milliseconds. A few job titles misbehave on purpose:
+
+    Transient   answers 503 twice before the table, so it succeeds after two retries
+    Slow        stalls past the client timeout once, then answers
+    Broken      always answers 500, so it fails after all retries
+    Blocked     answers 200 with a page that has no table
+
+The scraper runs once per --workers value and reports requests per second. Every run
+must return the rows of all the good pages, retry as above and report exactly the
+Broken and Blocked pages as failed.
+"""
+import argparse
+import collections
+import http.server
+import os
+import sys
+import threading
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scrape'))
+
+from h1b_tables import synthetic_page
+from h1b.scrape_h1b import H1B_Scraper
+
+TRANSIENT_ERRORS = 2
+TIMEOUT = 1.0
+
+
+def make_handler(rows, latency, attempts, lock):
+    class StubHandler(http.server.BaseHTTPRequestHandler):
+        """Serves /index.php?em=&job=<job>&city=&year=<year>."""
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+            job, year = query['job'][0], int(query['year'][0])
+            with lock:
+                attempts[(year, job)] += 1
+                attempt = attempts[(year, job)]
+            time.sleep(latency)
+
+            status, body = 200, synthetic_page(rows, year)
+            if job == 'Transient' and attempt <= TRANSIENT_ERRORS:
+                status, body = 503, b'<html>Service unavailable</html>'
+            elif job == 'Slow' and attempt == 1:
+                time.sleep(TIMEOUT * 1.5)
+            elif job == 'Broken':
+                status, body = 500, b'<html>Internal error</html>'
+            elif job == 'Blocked':
+                body = b'<html><body>Access denied</body></html>'
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except OSError:
+                pass  # The client gave up on a stalled response
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=8, help="Number of well-behaved job titles")
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--rows', type=int, default=200, help="Rows per results table")
+    parser.add_argument('--latency', type=float, default=50, help="Milliseconds per response")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 6])
+    args = parser.parse_args()
+
+    years = list(range(2020, 2020 + args.years))
+    jobs = [f"Job {index}" for index in range(args.jobs)] + ['Transient', 'Slow', 'Broken', 'Blocked']
+    attempts = collections.Counter()
+    lock = threading.Lock()
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.rows, args.latency / 1000,
+                                                                            attempts, lock))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}/index.php"
+
+    results = []
+    for workers in args.workers:
+        attempts.clear()
+        scraper = H1B_Scraper(max_workers=workers, timeout=TIMEOUT, retries=3, backoff=0.05, base_url=base_url)
+        started = time.perf_counter()
+        data = scraper.scrape(years, jobs)
+        elapsed = time.perf_counter() - started
+
+        good_pages = len(years) * (len(jobs) - 2)
+        assert len(data) == good_pages * args.rows, (len(data), good_pages * args.rows)
+        assert sorted((year, job) for year, job, _ in scraper.failures) == \
+            sorted((year, job) for year in years for job in ['Broken', 'Blocked']), scraper.failures
+        for year in years:
+            assert attempts[(year, 'Transient')] == TRANSIENT_ERRORS + 1, attempts[(year, 'Transient')]
+            assert attempts[(year, 'Slow')] == 2, attempts[(year, 'Slow')]
+            assert attempts[(year, 'Broken')] == scraper.parser.retries + 1, attempts[(year, 'Broken')]
+        requests = sum(attempts.values())
+        results.append((workers, requests, len(data), len(scraper.failures), elapsed))
+    server.shutdown()
+
+    print(f"years: {args.years}, job titles: {len(jobs)}, rows per page: {args.rows}, latency: {args.latency:.0f}ms")
+    print(f"{'workers':<10}{'requests':>10}{'rows':>10}{'failed':>8}{'seconds':>10}{'req/s':>10}")
+    for workers, requests, rows, failed, elapsed in results:
+        print(f"{workers:<10}{requests:>10}{rows:>10}{failed:>8}{elapsed:>10.2f}{requests / elapsed:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
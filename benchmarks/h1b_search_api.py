@@ -0,0 +1,164 @@
+"""
+Load-tests the Flask H1B search against the original LIKE scan.
+
+Usage:
+    python benchmarks/h1b_search_api.py [--rows 1000000] [--clients 8] [--requests 400]
+
+Petitions are synthetic and loaded with load_data_into_database into a temporary
+database. The app is served by werkzeug's threaded server in a separate process, with an
+extra /legacy route that runs the original search: a new connection per request and
+LIKE '%term%' LIMIT 50. Client threads send each scenario's requests and report the
+throughput and latency percentiles. The deep page scenario follows next_after cursors
+from the first page.
+"""
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+import pandas as pd
+
+TITLES = ['SOFTWARE ENGINEER', 'SENIOR SOFTWARE ENGINEER', 'DATA SCIENTIST', 'DATA ENGINEER',
+          'MACHINE LEARNING ENGINEER', 'DEVOPS ENGINEER', 'BACKEND DEVELOPER', 'QUANTITATIVE ANALYST']
+
+SCENARIOS = [
+    ('legacy: common title', '/legacy', {'job_title': 'engineer'}),
+    ('legacy: rare title', '/legacy', {'job_title': 'quantitative analyst 7'}),
+    ('legacy: no match', '/legacy', {'job_title': 'physicist'}),
+    ('legacy: partial word', '/legacy', {'job_title': 'soft'}),
+    ('api: common title', '/api/search', {'job_title': 'engineer'}),
+    ('api: rare title', '/api/search', {'job_title': 'quantitative analyst 7'}),
+    ('api: no match', '/api/search', {'job_title': 'physicist'}),
+    ('api: partial word', '/api/search', {'job_title': 'soft'}),
+    ('api: year and salary', '/api/search', {'year': 2022, 'min_salary': 240000}),
+    ('api: employer prefix', '/api/search', {'employer': 'employer 123'}),
+    ('html: prefix and year', '/search', {'job_title': 'data sci*', 'year': 2021}),
+]
+
+
+def synthetic_petitions(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    titles = np.array([f"{title} {level}" for title in TITLES for level in range(10)], dtype=object)
+    submit = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 4 * 365, rows), unit='D')
+    return pd.DataFrame({
+        'EMPLOYER': pd.Series(rng.integers(0, 50_000, rows)).map(lambda i: f"EMPLOYER {i} INC"),
+        'JOB TITLE': titles[rng.integers(0, len(titles), rows)],
+        'BASE SALARY': rng.integers(60, 250, rows) * 1000,
+        'LOCATION': pd.Series(rng.integers(0, 3000, rows)).map(lambda i: f"CITY {i}, CA"),
+        'SUBMIT DATE': submit,
+        'START DATE': submit + pd.Timedelta(days=90),
+        'Year': submit.year,
+    })
+
+
+def serve(db_path, port):
+    """Serves the app on the port, with the original search added as /legacy."""
+    from flask import render_template, request
+    from werkzeug.serving import make_server
+    from app.app import app
+
+    def legacy():
+        job_title = request.values['job_title']
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM h1b_jobs WHERE `JOB TITLE` LIKE ? LIMIT 50", ('%' + job_title + '%',))
+        jobs = cursor.fetchall()
+        conn.close()
+        return render_template('search_results.html', jobs=jobs, next_params=None)
+
+    app.config['DATABASE'] = db_path
+    app.add_url_rule('/legacy', 'legacy', legacy, methods=['GET', 'POST'])
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def timed_get(url):
+    started = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        body = response.read()
+    return time.perf_counter() - started, body
+
+
+def run_load(urls, clients):
+    """@return: Tuple of requests per second and the array of latencies in seconds."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        latencies = np.array([latency for latency, _ in executor.map(timed_get, urls)])
+    return len(urls) / (time.perf_counter() - started), latencies
+
+
+def deep_page_urls(base, pages):
+    """@return: URLs of consecutive pages of the common title search, following the cursors."""
+    urls, after = [], None
+    for _ in range(pages):
+        params = {'job_title': 'engineer'} | ({'after': after} if after else {})
+        urls.append(f"{base}/api/search?{urllib.parse.urlencode(params)}")
+        after = json.loads(timed_get(urls[-1])[1])['next_after']
+        if after is None:
+            break
+    return urls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--serve', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve[0], int(args.serve[1]))
+        return
+
+    from app.app import load_data_into_database
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'h1b_data.db')
+        data = synthetic_petitions(args.rows)
+        started = time.perf_counter()
+        load_data_into_database(data, db_path)
+        print(f"rows: {args.rows}, load with indexes: {time.perf_counter() - started:.1f}s")
+
+        port = free_port()
+        server = subprocess.Popen([sys.executable, __file__, '--serve', db_path, str(port)],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        base = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(100):
+                try:
+                    timed_get(base + '/')
+                    break
+                except OSError:
+                    time.sleep(0.1)
+
+            print(f"{'scenario':<26}{'req/s':>8}{'p50 ms':>9}{'p99 ms':>9}")
+            scenarios = [(name, [f"{base}{path}?{urllib.parse.urlencode(params)}"] * args.requests)
+                         for name, path, params in SCENARIOS]
+            scenarios.append(('api: next pages', deep_page_urls(base, args.requests)))
+            for name, urls in scenarios:
+                rate, latencies = run_load(urls, args.clients)
+                print(f"{name:<26}{rate:>8.0f}{np.percentile(latencies, 50) * 1000:>9.1f}"
+                      f"{np.percentile(latencies, 99) * 1000:>9.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
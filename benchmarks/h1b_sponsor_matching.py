@@ -0,0 +1,94 @@
+"""
+Compares the original per-row H1B sponsor check with enrich_with_h1b.
+
+Usage:
+    python benchmarks/h1b_sponsor_matching.py [--jobs 7000] [--employers 100000] [--baseline-jobs 500]
+
+Synthetic H1B employer names are built from company words and legal suffixes, and job
+postings pick employers that partly appear in the H1B data. The original check scans
+every distinct H1B employer per posting, so it runs on --baseline-jobs postings and its
+time is scaled linearly to --jobs. enrich_with_h1b adds the sponsor columns to every
+posting once at processing time, including building its employer and phrase tables,
+and the dashboards only read the columns afterwards.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'data_processing'))
+
+import numpy as np
+import pandas as pd
+from sponsors import build_employer_table, build_phrase_table, enrich_with_h1b
+
+WORDS = ['acme', 'global', 'data', 'systems', 'cloud', 'labs', 'north', 'river', 'quantum', 'blue',
+         'health', 'bank', 'software', 'networks', 'capital', 'bio', 'energy', 'retail', 'logic', 'media']
+SUFFIXES = ['Inc.', 'LLC', 'Corporation', 'Ltd', '']
+
+
+def synthetic_employers(count, rng):
+    """Builds distinct-ish employer names of two or three words with a legal suffix."""
+    names = []
+    for index in range(count):
+        words = rng.choice(WORDS, rng.integers(1, 3)).tolist() + [f"co{index}"]
+        names.append(' '.join(word.title() for word in words) + ' ' + rng.choice(SUFFIXES))
+    return pd.Series(names).str.strip()
+
+
+def legacy_sponsors(employers, h1b_employers):
+    """The original dashboard check: is the employer a substring of any H1B employer."""
+    h1b_companies_list = h1b_employers.dropna().str.lower().unique()
+
+    def is_h1b_sponsor(employer):
+        employer_lower = employer.lower()
+        return any(employer_lower in h1b_company for h1b_company in h1b_companies_list)
+
+    return employers.astype(str).apply(is_h1b_sponsor).to_numpy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=7000)
+    parser.add_argument('--employers', type=int, default=100_000)
+    parser.add_argument('--baseline-jobs', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    h1b_employers = synthetic_employers(args.employers, rng)
+    # Half of the postings are from H1B employers, written without the legal suffix
+    known = h1b_employers.sample(args.jobs // 2, random_state=0, replace=True)
+    known = known.str.replace(r'\s+(Inc\.|LLC|Corporation|Ltd)$', '', regex=True)
+    unknown = synthetic_employers(args.jobs - len(known), np.random.default_rng(1)) + ' Unlisted'
+    jobs = pd.concat([known, unknown], ignore_index=True).sample(frac=1, random_state=0).reset_index(drop=True)
+    baseline_jobs = min(args.jobs, args.baseline_jobs)
+
+    started = time.perf_counter()
+    legacy = legacy_sponsors(jobs.iloc[:baseline_jobs], h1b_employers)
+    baseline = (time.perf_counter() - started) * args.jobs / baseline_jobs
+
+    h1b = pd.DataFrame({'EMPLOYER': h1b_employers, 'JOB TITLE': 'Software Engineer',
+                        'BASE SALARY': rng.integers(60, 250, len(h1b_employers)) * 1000,
+                        'Year': rng.integers(2018, 2024, len(h1b_employers))})
+    postings = pd.DataFrame({'employer': jobs, 'job_title': 'Software Engineer'})
+
+    started = time.perf_counter()
+    phrases = build_phrase_table(build_employer_table(h1b))
+    tables = time.perf_counter() - started
+
+    started = time.perf_counter()
+    enriched = enrich_with_h1b(postings, h1b)['h1b_sponsor'].to_numpy()
+    enrich = time.perf_counter() - started
+
+    scaled = " (scaled)" if baseline_jobs < args.jobs else ""
+    agreement = (legacy == enriched[:baseline_jobs]).mean()
+    print(f"jobs x employers:  {args.jobs} x {args.employers}")
+    print(f"original:          {baseline:.2f}s{scaled}, on every dashboard rerun")
+    print(f"enrich_with_h1b:   {enrich:.2f}s, once per processing run")
+    print(f"  table build:     {tables:.2f}s of that ({len(phrases)} phrases)")
+    print(f"speedup:           {baseline / enrich:.0f}x")
+    print(f"agreement:         {agreement:.1%} of {baseline_jobs} postings")
+
+
+if __name__ == '__main__':
+    main()
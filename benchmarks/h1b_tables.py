@@ -0,0 +1,95 @@
+"""
+Compares the original and single-pass H1B table ingestion on synthetic pages.
+
+Usage:
+    python benchmarks/h1b_tables.py [--pages 12] [--rows 20000]
+
+Each synthetic page holds one h1bdata.info style table with `rows` rows, standing in
+for one (year, job) page. The baseline parses every table twice with BeautifulSoup and
+grows the result with pd.concat per table; the single-pass path is what H1B_Scraper
+uses now. Each path runs in its own process so peak RSS is measured separately.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scrape'))
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from h1b.scrape_h1b import H1B_Scraper, HTMLTableParser
+
+
+def synthetic_page(rows, seed):
+    """Builds an h1bdata.info style results page with the given number of rows."""
+    header = ''.join(f'<th>{name}</th>' for name in
+                     ['EMPLOYER', 'JOB TITLE', 'BASE SALARY', 'LOCATION', 'SUBMIT DATE', 'START DATE'])
+    body = ''.join(
+        f'<tr><td><a href="/?em=E{i % 997}">EMPLOYER {i % 997} INC</a></td><td>SOFTWARE ENGINEER</td>'
+        f'<td>{80000 + (i * 37 + seed) % 120000:,}</td><td>SAN JOSE, CA</td>'
+        f'<td>{1 + i % 12:02d}/{1 + i % 28:02d}/2021</td><td>{1 + (i + 3) % 12:02d}/01/2021</td></tr>'
+        for i in range(rows))
+    return f'<html><body><table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table></body></html>'.encode()
+
+
+def baseline(pages):
+    """The original ingestion: double BeautifulSoup parse and pd.concat per table."""
+    parser = HTMLTableParser()
+    all_data = pd.DataFrame()
+    for page in pages:
+        soup = BeautifulSoup(page, 'lxml')
+        tables = [parser.parse_html_table(table) for table in soup.find_all('table')
+                  if not parser.parse_html_table(table).empty]
+        for table in tables:
+            H1B_Scraper.str2int(table, 'BASE SALARY')
+            table['Year'] = 2021
+            all_data = pd.concat([all_data, table], ignore_index=True)
+    return all_data
+
+
+def single_pass(pages):
+    """The current ingestion: one lxml pass per table, a single concat and typed columns."""
+    parser = HTMLTableParser()
+    frames = []
+    for page in pages:
+        for table in parser.parse_tables(page):
+            table['Year'] = 2021
+            frames.append(table)
+    all_data = pd.concat(frames, ignore_index=True)
+    H1B_Scraper.convert_types(all_data)
+    return all_data
+
+
+def run(name, page_count, rows, results):
+    """Ingests the synthetic pages with one path and reports time and peak RSS."""
+    pages = [synthetic_page(rows, seed) for seed in range(page_count)]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    data = {'baseline': baseline, 'single-pass': single_pass}[name](pages)
+    elapsed = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    results.put((name, len(data), elapsed, rss / scale, (rss - rss_before) / scale))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=12)
+    parser.add_argument('--rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    results = multiprocessing.Queue()
+    print(f"{'path':<13}{'rows':>10}{'seconds':>10}{'peak RSS MB':>14}{'growth MB':>12}")
+    for name in ['baseline', 'single-pass']:
+        process = multiprocessing.Process(target=run, args=(name, args.pages, args.rows, results))
+        process.start()
+        name, rows, elapsed, rss, growth = results.get()
+        process.join()
+        print(f"{name:<13}{rows:>10}{elapsed:>10.2f}{rss:>14.1f}{growth:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Runs scrape_linkedin_jobs against a local stub of the LinkedIn guest endpoints.
+
+Usage:
+    python benchmarks/linkedin_fetch_stub.py [--roles 4] [--pages 3] [--latency 50] [--workers 1 8]
+
+A ThreadingHTTPServer serves search pages of 10 job cards and a posting page per job,
+each after --latency milliseconds. Neighbouring roles share half of their results, so
+discovery also has to deduplicate across roles. The scraper runs once per --workers
+value and reports requests per second; every run must find each job once and parse a
+company for every posting.
+"""
+import argparse
+import http.server
+import os
+import sys
+import threading
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scrape'))
+
+from linkedin.scrape_linkedin import scrape_linkedin_jobs
+
+CARDS_PER_PAGE = 10
+
+
+def role_job_ids(role_index, pages):
+    """IDs role role_index finds; each role shares its first half with the previous one."""
+    first = role_index * pages * CARDS_PER_PAGE // 2
+    return [str(100_000 + job_id) for job_id in range(first, first + pages * CARDS_PER_PAGE)]
+
+
+def search_page(job_ids):
+    cards = ''.join(f'<li><div class="base-card" data-entity-urn="urn:li:jobPosting:{job_id}"></div></li>'
+                    for job_id in job_ids)
+    return f'<html><body><ul>{cards}</ul></body></html>'
+
+
+def posting_page(job_id):
+    return (f'<html><body><div class="top-card-layout__card"><a><img alt="Company {job_id}"></a></div>'
+            f'<div class="top-card-layout__entity-info"><a>Engineer {job_id}</a></div>'
+            '<ul class="description__job-criteria-list">'
+            '<li>Seniority level <span>Entry level</span></li>'
+            '<li>Employment type <span class="description__job-criteria-text--criteria">Full-time</span></li>'
+            '</ul></body></html>')
+
+
+def make_handler(roles, pages, latency, counts):
+    class StubHandler(http.server.BaseHTTPRequestHandler):
+        """Serves /search?keywords=<role>&start=<offset> and /posting/<id>."""
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(latency)
+            url = urllib.parse.urlsplit(self.path)
+            if url.path == '/search':
+                query = urllib.parse.parse_qs(url.query)
+                job_ids = role_job_ids(roles.index(query['keywords'][0]), pages)
+                start = int(query['start'][0])
+                body = search_page(job_ids[start:start + CARDS_PER_PAGE])
+            else:
+                body = posting_page(url.path.rsplit('/', 1)[-1])
+            with counts['lock']:
+                counts['requests'] += 1
+            data = body.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--roles', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=50, help="Milliseconds per response")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8])
+    args = parser.parse_args()
+
+    roles = [f"Role {index}" for index in range(args.roles)]
+    expected = {job_id for index in range(args.roles) for job_id in role_job_ids(index, args.pages)}
+    counts = {'requests': 0, 'lock': threading.Lock()}
+    server = http.server.ThreadingHTTPServer(
+        ('127.0.0.1', 0), make_handler(roles, args.pages, args.latency / 1000, counts))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    results = []
+    for workers in args.workers:
+        counts['requests'] = 0
+        started = time.perf_counter()
+        jobs = scrape_linkedin_jobs(roles, args.pages, max_workers=workers, base_url=f"{base}/search?",
+                                    job_url=f"{base}/posting/")
+        elapsed = time.perf_counter() - started
+        companies = set(jobs['company'].dropna())
+        assert len(jobs) == len(expected), (len(jobs), len(expected))
+        assert companies == {f"Company {job_id}" for job_id in expected}, "postings missing or unparsed"
+        results.append((workers, counts['requests'], elapsed))
+    server.shutdown()
+
+    print(f"roles: {args.roles}, pages per role: {args.pages}, jobs: {len(expected)}, latency: {args.latency:.0f}ms")
+    print(f"{'workers':<10}{'requests':>10}{'seconds':>10}{'req/s':>10}")
+    for workers, requests, elapsed in results:
+        print(f"{workers:<10}{requests:>10}{elapsed:>10.2f}{requests / elapsed:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
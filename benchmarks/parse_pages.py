@@ -0,0 +1,68 @@
+"""
+Compares the BeautifulSoup and lxml parser backends on saved job pages.
+
+Usage:
+    python benchmarks/parse_pages.py [--linkedin DIR] [--glassdoor DIR] [--rounds 20]
+
+--linkedin points at saved LinkedIn job posting pages and --glassdoor at saved
+Glassdoor search pages (*.html). Each backend parses every page `rounds` times; the
+CPU time per page is reported and both backends must extract identical records.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scrape'))
+
+from linkedin.scrape_linkedin import parse_job_posting
+from glassdoor.scrape_glassdoor import parse_job_list
+
+BACKENDS = ['bs4', 'lxml']
+
+
+def load_pages(directory):
+    """Reads every .html file in a directory as bytes."""
+    names = sorted(name for name in os.listdir(directory) if name.endswith('.html'))
+    pages = []
+    for name in names:
+        with open(os.path.join(directory, name), 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+
+def benchmark(label, pages, parse, rounds):
+    """Times parse(page, backend) for each backend and checks that the outputs agree."""
+    if not pages:
+        sys.exit(f"No .html fixtures found for {label}")
+    timings = {}
+    outputs = {}
+    for backend in BACKENDS:
+        started = time.process_time()
+        for _ in range(rounds):
+            outputs[backend] = [parse(page, backend) for page in pages]
+        timings[backend] = (time.process_time() - started) / (rounds * len(pages))
+    status = "match" if outputs['bs4'] == outputs['lxml'] else "MISMATCH"
+    print(f"{label:<10}{len(pages):>7}{timings['bs4'] * 1000:>12.2f}{timings['lxml'] * 1000:>12.2f}"
+          f"{timings['bs4'] / timings['lxml']:>10.1f}x  {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linkedin', help="Directory of saved LinkedIn job posting pages")
+    parser.add_argument('--glassdoor', help="Directory of saved Glassdoor search pages")
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+    if not args.linkedin and not args.glassdoor:
+        parser.error("pass --linkedin and/or --glassdoor")
+
+    print(f"{'source':<10}{'pages':>7}{'bs4 ms':>12}{'lxml ms':>12}{'speedup':>11}")
+    if args.linkedin:
+        benchmark('linkedin', load_pages(args.linkedin), parse_job_posting, args.rounds)
+    if args.glassdoor:
+        benchmark('glassdoor', load_pages(args.glassdoor),
+                  lambda page, backend: parse_job_list(page, 'benchmark', backend), args.rounds)
+
+
+if __name__ == '__main__':
+    main()
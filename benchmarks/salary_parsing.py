@@ -0,0 +1,100 @@
+"""
+Compares the original apply/iterrows salary cleaning with the vectorized parser.
+
+Usage:
+    python benchmarks/salary_parsing.py [--rows 1000000] [--baseline-rows 100000]
+
+Salaries are sampled from realistic Glassdoor formats. The original path is slow
+enough that it runs on --baseline-rows rows, and its time is scaled linearly to
+--rows for the speedup.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'data_processing'))
+
+import numpy as np
+import pandas as pd
+from salary import parse_salaries
+
+FORMATS = [
+    '${low}K - ${high}K\xa0(Employer est.)',
+    '${low}K - ${high}K\xa0(Glassdoor est.)',
+    '${low}K\xa0(Employer est.)',
+    '${hourly}.00 - ${hourly_high}.00\xa0Per Hour\xa0(Employer est.)',
+    '${hourly}.00\xa0Per Hour\xa0(Employer est.)',
+    None,
+]
+
+
+def synthetic_salaries(rows, seed=0):
+    """Builds a Series of salary strings in the formats Glassdoor uses."""
+    rng = np.random.default_rng(seed)
+    kinds = rng.integers(0, len(FORMATS), rows)
+    low = rng.integers(40, 200, rows)
+    hourly = rng.integers(15, 90, rows)
+    values = []
+    for kind, lo, hr in zip(kinds, low, hourly):
+        template = FORMATS[kind]
+        values.append(None if template is None else template.format(
+            low=lo, high=lo + 40, hourly=hr, hourly_high=hr + 10))
+    return pd.Series(values, dtype=object)
+
+
+def legacy_clean(salary):
+    """The original clean_salary_data salary logic: apply plus two iterrows passes."""
+    data = pd.DataFrame({'salary': salary})
+    data['salary'] = data['salary'].str.replace('\\(Employer est.\\)', '', regex=True)
+    data['salary'] = data['salary'].str.replace('(Per Hour)', '', regex=True)
+    data['salary'] = data['salary'].str.replace('\\(Glassdoor est.\\)', '', regex=True)
+
+    def hourly_to_yearly(salary):
+        if pd.isna(salary) or str(salary).lower() == 'not applicable':
+            return 'Not Applicable', 'Not Applicable'
+        elif ' - ' in salary:
+            low, high = map(float, salary.replace('$', '').replace('K', '000').split(' - '))
+            return low, high
+        else:
+            try:
+                single_value = float(salary.replace('$', '').replace('K', '000'))
+                return single_value * 0.6, single_value
+            except ValueError:
+                return 'Not Applicable', 'Not Applicable'
+
+    data[['Min_Salary', 'Max_Salary']] = pd.DataFrame(
+        data['salary'].apply(hourly_to_yearly).tolist(), index=data.index)
+    for column in ['Min_Salary', 'Max_Salary']:
+        for index, row in data.iterrows():
+            if row[column] != 'Not Applicable' and float(row[column]) < 200.0:
+                data.at[index, column] = float(row[column]) * 40 * 52
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--baseline-rows', type=int, default=100_000)
+    args = parser.parse_args()
+
+    salaries = synthetic_salaries(args.rows)
+    baseline_rows = min(args.rows, args.baseline_rows)
+
+    started = time.perf_counter()
+    legacy_clean(salaries.iloc[:baseline_rows])
+    baseline = (time.perf_counter() - started) * args.rows / baseline_rows
+
+    started = time.perf_counter()
+    parse_salaries(salaries)
+    vectorized = time.perf_counter() - started
+
+    scaled = " (scaled)" if baseline_rows < args.rows else ""
+    print(f"rows:        {args.rows}")
+    print(f"original:    {baseline:.2f}s{scaled}")
+    print(f"vectorized:  {vectorized:.2f}s")
+    print(f"speedup:     {baseline / vectorized:.0f}x")
+
+
+if __name__ == '__main__':
+    main()
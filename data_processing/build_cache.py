@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import functools
+import hashlib
+import inspect
+import os
+import types
+import pandas as pd
+
+
+def content_hash(data):
+    """
+    Hashes the contents of a DataFrame, including its column names and dtypes.
+    @param data: DataFrame to hash.
+    @return: Hex digest of the contents.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr([(str(name), str(dtype)) for name, dtype in data.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(function):
+    """
+    Hashes the source of a function and of the module-level functions and constants
+    it uses, recursively, so a stage is rebuilt when any code it depends on changes.
+    @param function: Stage function.
+    @return: Hex digest of the code.
+    """
+    digest = hashlib.sha256()
+    pending = [function]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        digest.update(inspect.getsource(current).encode('utf-8'))
+        for name in sorted(current.__code__.co_names):
+            value = current.__globals__.get(name)
+            if isinstance(value, types.FunctionType) and not value.__module__.startswith(('pandas', 'numpy')):
+                pending.append(value)
+            elif isinstance(value, (str, int, float, tuple)):
+                digest.update(f"{name}={value!r}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """
+    A content-addressed store of stage outputs, one Parquet file per output key.
+
+    A key is derived from the stage's code version and the keys of its inputs, so it
+    can be computed without running anything, like a make rule whose target name
+    encodes its prerequisites.
+    """
+
+    def __init__(self, directory):
+        """
+        @param directory: Directory holding the cached outputs.
+        """
+        self.directory = directory
+        self.used = set()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def stage_key(stage, input_keys):
+        """
+        Derives the key of a stage output.
+        @param stage: Stage function.
+        @param input_keys: Keys or content hashes of the stage inputs, in order.
+        @return: Hex digest identifying the output.
+        """
+        return hashlib.sha256('\n'.join([code_version(stage)] + list(input_keys)).encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        """
+        @param key: Output key.
+        @return: Path of the cached output file.
+        """
+        return os.path.join(self.directory, f"{key}.parquet")
+
+    def load(self, key):
+        """
+        @param key: Output key.
+        @return: The cached DataFrame, or None if it has not been built.
+        """
+        self.used.add(key)
+        if os.path.exists(self.path(key)):
+            self.hits += 1
+            return pd.read_parquet(self.path(key))
+        self.misses += 1
+        return None
+
+    def store(self, key, data):
+        """
+        @param key: Output key.
+        @param data: DataFrame to cache.
+        """
+        self.used.add(key)
+        data.to_parquet(self.path(key) + '.tmp', index=False)
+        os.replace(self.path(key) + '.tmp', self.path(key))
+
+    def prune(self):
+        """Deletes cached outputs that were not used or referenced since the cache was opened."""
+        for name in os.listdir(self.directory):
+            if name.endswith('.parquet') and name[:-len('.parquet')] not in self.used:
+                os.remove(os.path.join(self.directory, name))
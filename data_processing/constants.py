@@ -4,3 +4,7 @@ H1B_SCRAPED = "scrape/h1b/scrape_h1b.csv"
 LINKEDIN_CLEANED_DATA = "scrape/linkedin/clean_linkedin.csv"
 AGGREGATED_DATA = "data_processing/aggregated_data.csv"
 PROCESSED_AGGREGATED_DATA = "data_processing/processed_aggregated_data.csv"
+H1B_DATASET = "scrape/h1b/h1b_dataset"
+ARTIFACT_DIR = "data_processing/artifacts"
+BUILD_CACHE_DIR = "data_processing/build"
+JOBS_DB = "Db/jobs.db"
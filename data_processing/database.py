@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+import pyarrow.dataset as ds
+
+# Rows written per INSERT batch, so the H1B data is streamed rather than loaded whole
+BATCH_ROWS = 100_000
+
+# Indexed columns per table. Single-column indexes also serve the dashboards' sorts, whose
+# rowid tiebreak they hold; the H1B year and salary index covers those filters together
+INDEXES = {
+    'current_jobs': [('employer',), ('job_title',), ('location',), ('min_salary',), ('max_salary',)],
+    'h1b': [('EMPLOYER',), ('JOB TITLE',), ('LOCATION',), ('BASE SALARY',), ('Year',), ('Year', 'BASE SALARY')],
+    'rollup': [('dataset', 'dimension', 'year')],
+    'salary_histogram': [('dataset',)],
+}
+
+
+def create_indexes(conn, table):
+    """Creates the indexes the dashboard filters use."""
+    for columns in INDEXES[table]:
+        name = f"idx_{table}_" + '_'.join(column.lower().replace(' ', '_') for column in columns)
+        column_list = ', '.join(f'"{column}"' for column in columns)
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({column_list})')
+
+
+def write_h1b_table(conn, dataset_path):
+    """
+    Streams the year-partitioned H1B dataset into the h1b table in batches.
+    @param conn: Open database connection.
+    @param dataset_path: Path of the Parquet dataset.
+    @return: Number of rows written.
+    """
+    dataset = ds.dataset(dataset_path, format='parquet', partitioning='hive')
+    rows = 0
+    for batch in dataset.to_batches(batch_size=BATCH_ROWS):
+        frame = batch.to_pandas()
+        frame['Year'] = frame['Year'].astype(int)
+        frame.to_sql('h1b', conn, if_exists='append', index=False)
+        rows += len(frame)
+    return rows
+
+
+def write_database(processed, db_path, h1b_dataset=None, summaries=None):
+    """
+    Writes the processed postings and the H1B petitions into an indexed SQLite database
+    for the dashboards. The database is built under a temporary name and swapped in, so
+    a running dashboard never reads a half-written file.
+    @param processed: Processed DataFrame of job postings.
+    @param db_path: Path of the database file.
+    @param h1b_dataset: Path of the H1B Parquet dataset, or None to skip the h1b table.
+    @param summaries: Dict of table name to DataFrame of precomputed summaries, such as
+    the analytics rollup.
+    """
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        processed.to_sql('current_jobs', conn, index=False, chunksize=BATCH_ROWS)
+        create_indexes(conn, 'current_jobs')
+        message = f"Wrote {len(processed)} postings"
+        if h1b_dataset is not None:
+            rows = write_h1b_table(conn, h1b_dataset)
+            if rows:
+                create_indexes(conn, 'h1b')
+            message += f" and {rows} H1B petitions"
+        for table, summary in (summaries or {}).items():
+            summary.to_sql(table, conn, index=False, chunksize=BATCH_ROWS)
+            create_indexes(conn, table)
+        conn.execute('ANALYZE')
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+    print(f"{message} to {db_path}")
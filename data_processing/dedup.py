@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+import zlib
+import numpy as np
+import pandas as pd
+
+# MinHash signature length and LSH banding; 8 bands of 4 rows find pairs above ~0.6 similarity
+NUM_PERMUTATIONS = 32
+NUM_BANDS = 8
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.8
+
+# Employers are processed in chunks of roughly this many rows to bound memory
+CHUNK_ROWS = 200_000
+
+# Hash permutations are (a * x + b) mod p; a and x are below 2**32 so a * x fits in 64 bits
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20231201)
+PERMUTATION_A = _rng.integers(1, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64)
+PERMUTATION_B = _rng.integers(0, 1 << 32, NUM_PERMUTATIONS, dtype=np.uint64)
+
+EMPLOYER_SUFFIXES = r'\b(?:inc|llc|l\.l\.c|ltd|limited|corp|corporation|co|company|plc|lp|llp|gmbh)\b'
+
+# Title words that set a posting's level; titles only merge when these match exactly
+LEVEL_WORDS = {'sr': 'senior', 'senior': 'senior', 'jr': 'junior', 'junior': 'junior', 'staff': 'staff',
+               'principal': 'principal', 'lead': 'lead', 'associate': 'associate'}
+ROMAN_NUMERALS = {'i': 1, 'ii': 2, 'iii': 3, 'iv': 4, 'v': 5, 'vi': 6, 'vii': 7, 'viii': 8, 'ix': 9, 'x': 10}
+
+
+def normalize_text(series):
+    """
+    Lowercases text and reduces punctuation and whitespace to single spaces.
+    Each distinct value is normalized once, since postings repeat the same names.
+    @param series: Series of strings.
+    @return: Series of normalized strings, empty where the input is missing.
+    """
+    codes, uniques = pd.factorize(series)
+    normalized = (pd.Series(uniques, dtype=object).astype(str).str.lower()
+                  .str.replace(r'[^0-9a-z]+', ' ', regex=True).str.strip())
+    return pd.Series(np.append(normalized.to_numpy(dtype=object), '')[codes], index=series.index)
+
+
+def normalize_employer(series):
+    """
+    Normalizes employer names and drops legal suffixes such as Inc or LLC.
+    @param series: Series of employer names.
+    @return: Series of employer keys.
+    """
+    codes, uniques = pd.factorize(normalize_text(series))
+    normalized = (pd.Series(uniques, dtype=object).str.replace(EMPLOYER_SUFFIXES, ' ', regex=True)
+                  .str.replace(r'\s+', ' ', regex=True).str.strip())
+    return pd.Series(normalized.to_numpy(dtype=object)[codes], index=series.index)
+
+
+def shingles(text):
+    """
+    @param text: Normalized title.
+    @return: Set of character shingles of the title.
+    """
+    padded = f" {text} "
+    if len(padded) <= SHINGLE_SIZE:
+        return {padded}
+    return {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+
+def title_level(title):
+    """
+    @param title: Normalized title.
+    @return: Sorted tuple of the title's level words and numbers, with abbreviations and
+    roman numerals written the same way as their full forms.
+    """
+    levels = set()
+    for token in title.split():
+        if token in LEVEL_WORDS:
+            levels.add(LEVEL_WORDS[token])
+        elif token in ROMAN_NUMERALS:
+            levels.add(str(ROMAN_NUMERALS[token]))
+        elif token.isdigit():
+            levels.add(str(int(token)))
+    return tuple(sorted(levels))
+
+
+def minhash(shingle_sets):
+    """
+    @param shingle_sets: List of non-empty shingle sets.
+    @return: Array of MinHash signatures, one row of NUM_PERMUTATIONS values per set.
+    """
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for shingle_set in shingle_sets for s in shingle_set),
+                         dtype=np.uint64)
+    offsets = np.cumsum([0] + [len(shingle_set) for shingle_set in shingle_sets[:-1]])
+    permuted = (PERMUTATION_A[:, None] * hashes[None, :] + PERMUTATION_B[:, None]) % MERSENNE_PRIME
+    return np.minimum.reduceat(permuted, offsets, axis=1).T
+
+
+def find_root(parent, item):
+    """Finds the representative of an item in a union-find forest, compressing the path."""
+    while parent[item] != item:
+        parent[item] = parent[parent[item]]
+        item = parent[item]
+    return item
+
+
+def cluster_block(titles, locations, threshold):
+    """
+    Clusters the distinct (title, location) records of one employer.
+
+    Candidate pairs come from LSH buckets over MinHash signatures of the titles and
+    are confirmed by their exact shingle Jaccard similarity. Buckets are also keyed by
+    the title's level words and numbers, so different seniority levels never merge,
+    and by location, so a title posted in many cities is never compared across them.
+    A record without a location is then compared across locations, and joins at most
+    one cluster so it cannot bridge postings in different cities.
+    @param titles: List of normalized titles.
+    @param locations: List of normalized locations, '' when unknown.
+    @param threshold: Minimum Jaccard similarity of the titles.
+    @return: List with the representative record index of every record.
+    """
+    parent = list(range(len(titles)))
+    if len(titles) < 2:
+        return parent
+
+    shingle_sets = [shingles(title) for title in titles]
+    levels = [title_level(title) for title in titles]
+    unlocated = [index for index, location in enumerate(locations) if not location]
+    rows_per_band = NUM_PERMUTATIONS // NUM_BANDS
+    band_keys = []
+    located_buckets = {}
+    buckets = {}
+    for index, signature in enumerate(minhash(shingle_sets)):
+        keys = [(band, levels[index], signature[band * rows_per_band:(band + 1) * rows_per_band].tobytes())
+                for band in range(NUM_BANDS)]
+        band_keys.append(keys)
+        for key in keys:
+            if locations[index]:
+                located_buckets.setdefault(key + (locations[index],), []).append(index)
+            if unlocated:
+                buckets.setdefault(key, []).append(index)
+
+    def similar(i, j):
+        union = len(shingle_sets[i] | shingle_sets[j])
+        return len(shingle_sets[i] & shingle_sets[j]) / union >= threshold
+
+    def join(i, j):
+        root_i, root_j = find_root(parent, i), find_root(parent, j)
+        parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    # Pairs met again in another band are skipped once they share a cluster
+    for members in located_buckets.values():
+        for i_position, i in enumerate(members):
+            for j in members[i_position + 1:]:
+                if find_root(parent, i) != find_root(parent, j) and similar(i, j):
+                    join(i, j)
+
+    # Each record without a location stops at the first similar record it finds
+    attached = set()
+    for i in unlocated:
+        if i in attached:
+            continue
+        candidates = (j for key in band_keys[i] for j in buckets[key])
+        match = next((j for j in candidates if j != i and j not in attached and similar(i, j)), None)
+        if match is not None:
+            join(i, match)
+            attached.add(i)
+            if not locations[match]:
+                attached.add(match)
+
+    return [find_root(parent, index) for index in range(len(titles))]
+
+
+def assign_clusters(data, threshold=SIMILARITY_THRESHOLD, chunk_rows=CHUNK_ROWS):
+    """
+    Assigns every posting to a duplicate cluster.
+
+    Postings are blocked by normalized employer, so only postings of the same employer
+    are compared. Exact duplicates of (employer, title, location) collapse first, then
+    near-duplicate titles are found per employer with MinHash/LSH. Employers are handled
+    in chunks of about chunk_rows rows so only one chunk of keys is held at a time.
+    @param data: DataFrame with employer, job_title and location columns.
+    @param threshold: Minimum Jaccard similarity of titles to count as duplicates.
+    @param chunk_rows: Approximate number of rows per chunk.
+    @return: Integer array with the position of each row's cluster representative.
+    """
+    employers = normalize_employer(data['employer']).to_numpy()
+    order = np.argsort(employers, kind='stable')
+    boundaries = np.flatnonzero(employers[order][1:] != employers[order][:-1]) + 1
+    blocks = np.split(order, boundaries) if len(order) else []
+
+    cluster = np.arange(len(data))
+    chunk = []
+    chunk_size = 0
+    for block in blocks + [None]:
+        if block is not None and (chunk_size + len(block) <= chunk_rows or not chunk):
+            chunk.append(block)
+            chunk_size += len(block)
+            continue
+
+        positions = np.concatenate(chunk)
+        keys = pd.DataFrame({
+            'employer': employers[positions],
+            'title': normalize_text(data['job_title'].iloc[positions]).to_numpy(),
+            'location': normalize_text(data['location'].iloc[positions]).to_numpy(),
+        })
+        # Exact duplicates share a record; records keep the order of their first row,
+        # so they stay grouped by employer and each record's first row comes first
+        record = keys.groupby(['employer', 'title', 'location'], sort=False).ngroup().to_numpy()
+        first_row = np.unique(record, return_index=True)[1]
+        records = keys.iloc[first_row]
+        representative = positions[first_row]
+
+        record_employers = records['employer'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, record_employers[1:] != record_employers[:-1]])
+        ends = np.r_[starts[1:], len(records)]
+        titles = records['title'].tolist()
+        locations = records['location'].tolist()
+        # Rows without an employer are never treated as duplicates
+        for start, end in zip(starts, ends):
+            if end - start < 2 or not record_employers[start]:
+                continue
+            roots = cluster_block(titles[start:end], locations[start:end], threshold)
+            representative[start:end] = representative[start:end][roots]
+        missing = record_employers[record] == ''
+        cluster[positions[~missing]] = representative[record[~missing]]
+
+        chunk = [block] if block is not None else []
+        chunk_size = len(block) if block is not None else 0
+
+    return cluster
+
+
+def dedupe_jobs(data, threshold=SIMILARITY_THRESHOLD, chunk_rows=CHUNK_ROWS):
+    """
+    Collapses duplicate postings across technologies and sources into one record.
+
+    The merged record keeps the first non-missing value of each column, and its tech
+    and source columns list every tech and source of the duplicates, comma-separated
+    in order of appearance.
+    @param data: Processed DataFrame with employer, job_title, location, tech and source columns.
+    @param threshold: Minimum Jaccard similarity of titles to count as duplicates.
+    @param chunk_rows: Approximate number of rows per chunk while clustering.
+    @return: Deduplicated DataFrame.
+    """
+    if data.empty:
+        return data
+    cluster = assign_clusters(data, threshold, chunk_rows)
+    result = data.groupby(cluster, sort=True).first()
+    for column in ('tech', 'source'):
+        if column in data.columns:
+            values = data[[column]].assign(cluster=cluster).dropna().drop_duplicates()
+            # Only clusters with several distinct values need joining; first() covers the rest
+            several = values['cluster'].duplicated(keep=False).to_numpy()
+            joined = values[several].groupby('cluster', sort=True)[column].agg(','.join)
+            result.loc[joined.index, column] = joined
+    print(f"Collapsed {len(data)} postings into {len(result)} after deduplication")
+    return result.reset_index(drop=True)[data.columns]
@@ -1,19 +1,32 @@
 # -*- coding: utf-8 -*-
+import argparse
+import os
 import pandas as pd
 import numpy as np
-from constants import LINKEDIN_SCRAPED, GLASSDOOR_SCRAPED, H1B_SCRAPED, LINKEDIN_CLEANED_DATA, AGGREGATED_DATA, PROCESSED_AGGREGATED_DATA
+from salary import parse_salaries
+from build_cache import BuildCache, content_hash
+from dedup import dedupe_jobs
+from sponsors import enrich_with_h1b, H1B_COLUMNS
+from database import write_database
+from rollup import build_summaries
+from constants import (LINKEDIN_SCRAPED, GLASSDOOR_SCRAPED, PROCESSED_AGGREGATED_DATA, ARTIFACT_DIR, BUILD_CACHE_DIR,
+                       H1B_DATASET, JOBS_DB)
 
+# LinkedIn rows are hashed into this many partitions for incremental builds
+LINKEDIN_PARTITIONS = 16
 
-def clean_linkedin_data(input_path, output_path):
+
+def clean_linkedin_data(data):
     """
-    Cleans the LinkedIn job data and saves the cleaned data to a new CSV file.
-    @param input_path: Path to the input CSV file.
-    @param output_path: Path to the output CSV file.
+    Cleans the LinkedIn job data.
+    @param data: DataFrame of scraped LinkedIn jobs.
+    @return: Cleaned DataFrame.
     """
-    data = pd.read_csv(input_path)
     if 'employment type' in data.columns:
         data = data.drop(['employment type'], axis=1)
-    data = data[data['company'].notna()]
+    if 'job-id' in data.columns:
+        data = data.drop(['job-id'], axis=1)
+    data = data[data['company'].notna()].copy()
 
     data['level'] = data['level'].str.replace(
         'Employment type\n\s*Full-time', 'Full-Time', regex=True)
@@ -24,95 +37,196 @@ def clean_linkedin_data(input_path, output_path):
 
     data = data[~data['level'].isin(values_to_drop)].reset_index(drop=True)
 
-    data.to_csv(output_path)
     return data
 
 
-def combine_tables(csv_file1, csv_file2, output_path):
+def combine_tables(df1, df2):
     """
-    Combines two CSV files into a single DataFrame and saves the result to a new CSV file.
-    @param csv_file1: Path to the first CSV file.
-    @param csv_file2: Path to the second CSV file.
-    @param output_path: Path to the output CSV file.
+    Combines the Glassdoor and cleaned LinkedIn jobs into a single DataFrame, with a
+    source column recording where each row came from.
+    @param df1: DataFrame of Glassdoor jobs.
+    @param df2: DataFrame of cleaned LinkedIn jobs.
+    @return: Combined DataFrame.
     """
-    # Read CSV files into DataFrames
-    df1 = pd.read_csv(csv_file1)
-    df2 = pd.read_csv(csv_file2)
-
     # Rename columns in the second table to match the first table
-    df2.rename(columns={'company': 'name-of-company',
-               'job-title': 'name-of-job'}, inplace=True)
+    df2 = df2.rename(columns={'company': 'name-of-company',
+                              'job-title': 'name-of-job'})
 
     # Add a new column 'level' with NA values for the first table
-    df1['level'] = None
+    df1 = df1.assign(level=None, source='glassdoor')
+    df2 = df2.assign(source='linkedin')
 
     # Append rows from the second table to the first table
     result = pd.concat([df1, df2], ignore_index=True, sort=False)
 
     result['name-of-company'] = result['name-of-company'].str.replace(r'\d+\.\d+', '', regex=True)
-    print(result)
-    result.to_csv(output_path)
     return result
 
 
-def clean_salary_data(input_path, output_path):
+def clean_salary_data(data):
     """
-    Cleans the salary data and saves the cleaned data to a new CSV file.
-    @param input_path: Path to the input CSV file.
-    @param output_path: Path to the output CSV file.
+    Cleans the salary data and normalizes the column names.
+    Salaries are annualized into float min_salary and max_salary columns, NaN when a
+    listing has no usable salary, and the listing's pay period is kept in pay_period.
+    @param data: Combined DataFrame with a raw salary column.
     @return: Cleaned DataFrame.
     """
-    data = pd.read_csv(input_path)
-
-    data['salary'] = data['salary'].str.replace(
-        '\(Employer est.\)', '', regex=True)
-    data['salary'] = data['salary'].str.replace('(Per Hour)', '', regex=True)
-    data['salary'] = data['salary'].str.replace(
-        '\(Glassdoor est.\)', '', regex=True)
-
-    def hourly_to_yearly(salary):
-        if pd.isna(salary) or str(salary).lower() == 'not applicable':
-            return 'Not Applicable', 'Not Applicable'
-        elif ' - ' in salary:
-            low, high = map(float, salary.replace(
-                '$', '').replace('K', '000').split(' - '))
-            return low, high
-        else:
-            try:
-                single_value = float(salary.replace(
-                    '$', '').replace('K', '000'))
-                min_value = single_value * 0.6
-                return min_value, single_value
-            except ValueError:
-                return 'Not Applicable', 'Not Applicable'
-
-    data[['Min_Salary', 'Max_Salary']] = pd.DataFrame(
-        data['salary'].apply(hourly_to_yearly).tolist(), index=data.index)
-
-    for index, row in data.iterrows():
-        if row['Min_Salary'] == 'Not Applicable':
-            data.at[index, 'Min_Salary'] = 'Not Applicable'
-        elif float(row['Min_Salary']) < 200.0:
-            data.at[index, 'Min_Salary'] = float(row['Min_Salary']) * 40 * 52
-
-    for index, row in data.iterrows():
-        if row['Max_Salary'] == 'Not Applicable':
-            data.at[index, 'Max_Salary'] = 'Not Applicable'
-        elif float(row['Max_Salary']) < 200.0:
-            data.at[index, 'Max_Salary'] = float(row['Max_Salary']) * 40 * 52
-
-    data = data.drop(['salary', 'Unnamed: 0.1', 'Unnamed: 0'], axis=1)
+    data = data.join(parse_salaries(data['salary']))
+
+    data = data.drop(['salary'], axis=1)
     data = data.rename(columns={'name-of-company': 'employer', 'name-of-job': 'job_title', 'location': 'location',
-                       'date-posted': 'submit_date', 'level': 'job_type', 'tech': 'tech', 'Min_Salary': 'min_salary', 'Max_Salary': 'max_salary'})
-    data.to_csv(output_path, index=False)
+                       'date-posted': 'submit_date', 'level': 'job_type', 'tech': 'tech'})
     return data
 
 
-# Clean LinkedIn job data
-clean_linkedin_data(LINKEDIN_SCRAPED, LINKEDIN_CLEANED_DATA)
+# Each stage is (output name, function, input names); inputs are pipeline inputs or earlier outputs
+PIPELINE = [
+    ('clean_linkedin', clean_linkedin_data, ['linkedin']),
+    ('aggregated', combine_tables, ['glassdoor', 'clean_linkedin']),
+    ('processed', clean_salary_data, ['aggregated']),
+]
+
+
+def run_pipeline(inputs, stages=PIPELINE, artifacts=(), artifact_dir=ARTIFACT_DIR):
+    """
+    Runs processing stages in order, passing DataFrames between them in memory.
+    @param inputs: Dict of named input DataFrames, e.g. 'linkedin' and 'glassdoor'.
+    @param stages: List of (output name, function, input names) stages.
+    @param artifacts: Names of stage outputs to also write to artifact_dir as Parquet.
+    @param artifact_dir: Directory for the requested artifacts.
+    @return: Dict of every input and stage output by name.
+    """
+    frames = dict(inputs)
+    for name, stage, input_names in stages:
+        frames[name] = stage(*(frames[input_name] for input_name in input_names))
+        if name in artifacts:
+            write_artifact(frames[name], name, artifact_dir)
+    return frames
+
+
+def partition_inputs(inputs):
+    """
+    Splits the pipeline inputs into partitions that can be processed independently,
+    since every stage works row by row. Glassdoor rows are partitioned by tech, as each
+    tech is scraped as a unit; LinkedIn rows by a hash of their job ID, so a refreshed
+    posting only changes its own partition wherever the scraper moves it in the file.
+    @param inputs: Dict with the 'glassdoor' and 'linkedin' DataFrames.
+    @return: List of (partition name, inputs dict) pairs in output order.
+    """
+    glassdoor, linkedin = inputs['glassdoor'], inputs['linkedin']
+    partitions = []
+    for tech, part in glassdoor.groupby('tech', sort=False, dropna=False):
+        partitions.append((f"glassdoor-{tech}", {'glassdoor': part, 'linkedin': linkedin.iloc[0:0]}))
+    for bucket, part in linkedin.groupby(linkedin_buckets(linkedin), sort=True):
+        partitions.append((f"linkedin-{bucket}", {'glassdoor': glassdoor.iloc[0:0], 'linkedin': part}))
+    return partitions
+
+
+def linkedin_buckets(linkedin):
+    """
+    Assigns LinkedIn rows to partitions by a stable hash of their job ID. Rows saved
+    before job IDs were recorded are hashed by their contents instead.
+    @param linkedin: DataFrame of scraped LinkedIn jobs.
+    @return: Series of partition numbers below LINKEDIN_PARTITIONS.
+    """
+    hashes = pd.util.hash_pandas_object(linkedin.drop(columns='job-id', errors='ignore'), index=False)
+    if 'job-id' in linkedin.columns:
+        job_ids = linkedin['job-id']
+        hashes = pd.util.hash_pandas_object(job_ids.astype(str), index=False).where(job_ids.notna(), hashes)
+    return hashes % LINKEDIN_PARTITIONS
 
-# Combine LinkedIn and Glassdoor job data
-combine_tables(GLASSDOOR_SCRAPED, LINKEDIN_CLEANED_DATA, AGGREGATED_DATA)
 
-# Clean salary data
-clean_salary_data(AGGREGATED_DATA, PROCESSED_AGGREGATED_DATA)
+def run_incremental(inputs, stages=PIPELINE, output='processed', cache_dir=BUILD_CACHE_DIR):
+    """
+    Builds a stage output partition by partition, reusing cached stage outputs.
+    Each stage output is keyed by the stage's code version and the keys of its inputs,
+    starting from content hashes of the input partitions, so only partitions whose data
+    changed, and only stages downstream of a code change, are recomputed. The partition
+    outputs are then concatenated into the full result.
+    @param inputs: Dict with the 'glassdoor' and 'linkedin' DataFrames.
+    @param stages: List of (output name, function, input names) stages.
+    @param output: Name of the stage output to build.
+    @param cache_dir: Directory of the build cache.
+    @return: The built DataFrame.
+    """
+    cache = BuildCache(cache_dir)
+    stage_by_name = {name: (stage, input_names) for name, stage, input_names in stages}
+    results = []
+
+    for _, partition in partition_inputs(inputs):
+        keys = {}
+
+        def key_of(name):
+            if name not in keys:
+                if name in stage_by_name:
+                    stage, input_names = stage_by_name[name]
+                    keys[name] = BuildCache.stage_key(stage, [key_of(input_name) for input_name in input_names])
+                else:
+                    keys[name] = content_hash(partition[name])
+            return keys[name]
+
+        def materialize(name):
+            if name not in stage_by_name:
+                return partition[name]
+            data = cache.load(key_of(name))
+            if data is None:
+                stage, input_names = stage_by_name[name]
+                data = stage(*(materialize(input_name) for input_name in input_names))
+                cache.store(key_of(name), data)
+            return data
+
+        results.append(materialize(output))
+        # Keep the intermediate outputs so a later code change can restart from them
+        cache.used.update(key_of(name) for name in stage_by_name)
+
+    cache.prune()
+    print(f"Reused {cache.hits} cached stage outputs, rebuilt {cache.misses}")
+    return pd.concat(results, ignore_index=True)
+
+
+def write_artifact(data, name, artifact_dir=ARTIFACT_DIR):
+    """
+    Writes a stage output as a Parquet file named after the stage.
+    @param data: DataFrame to write.
+    @param name: Stage output name.
+    @param artifact_dir: Directory to write to.
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    data.to_parquet(os.path.join(artifact_dir, f"{name}.parquet"), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean and aggregate the scraped job data.")
+    parser.add_argument('--artifacts', nargs='*', default=[], choices=[name for name, _, _ in PIPELINE],
+                        help="Intermediate stage outputs to also save as Parquet")
+    parser.add_argument('--full', action='store_true',
+                        help="Reprocess everything in one pass instead of reusing the build cache")
+    args = parser.parse_args()
+
+    inputs = {
+        'linkedin': pd.read_csv(LINKEDIN_SCRAPED, dtype={'job-id': str}),
+        'glassdoor': pd.read_csv(GLASSDOOR_SCRAPED),
+    }
+    if args.full or args.artifacts:
+        processed = run_pipeline(inputs, artifacts=args.artifacts)['processed']
+    else:
+        processed = run_incremental(inputs)
+    # Duplicates can span partitions, so deduplication runs on the full output
+    processed = dedupe_jobs(processed)
+
+    # Join the postings against the H1B petitions once, so the dashboards only read the columns
+    h1b_dataset = H1B_DATASET if os.path.isdir(H1B_DATASET) else None
+    if h1b_dataset:
+        h1b = pd.read_parquet(h1b_dataset, columns=H1B_COLUMNS)
+    else:
+        print(f"No H1B dataset at {H1B_DATASET}, the H1B columns will be empty")
+        h1b = pd.DataFrame(columns=H1B_COLUMNS)
+    processed = enrich_with_h1b(processed, h1b)
+    del h1b
+    processed.to_csv(PROCESSED_AGGREGATED_DATA, index=False)
+    # The summaries stream the H1B dataset in batches
+    write_database(processed, JOBS_DB, h1b_dataset, summaries=build_summaries(processed, h1b_dataset))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+# Number of equal-width bins in the salary histograms
+HISTOGRAM_BINS = 50
+
+# H1B rows summarized per batch, so the dataset is streamed rather than loaded whole
+BATCH_ROWS = 100_000
+
+H1B_DIMENSIONS = {'year': 'Year', 'employer': 'EMPLOYER', 'location': 'LOCATION', 'title': 'JOB TITLE'}
+CURRENT_DIMENSIONS = {'employer': 'employer', 'location': 'location', 'title': 'job_title', 'tech': 'tech',
+                      'h1b_sponsor': 'h1b_sponsor'}
+
+# Comma-separated list dimensions, counted once per item
+LIST_DIMENSIONS = {'tech'}
+
+ROLLUP_COLUMNS = ['dataset', 'year', 'dimension', 'value', 'jobs',
+                  'salary_count', 'salary_sum', 'salary_min', 'salary_max']
+H1B_COLUMNS = ['EMPLOYER', 'JOB TITLE', 'BASE SALARY', 'LOCATION', 'Year']
+
+
+def aggregate(salary, keys):
+    """
+    @param salary: Series of salaries.
+    @param keys: List of Series to group by; empty for a single total.
+    @return: DataFrame of jobs, salary_count, salary_sum, salary_min and salary_max per group.
+    """
+    stats = ['size', 'count', 'sum', 'min', 'max']
+    if keys:
+        result = salary.groupby(keys, observed=True, dropna=True).agg(stats)
+    else:
+        result = salary.agg(stats).to_frame().T
+    return result.set_axis(['jobs', 'salary_count', 'salary_sum', 'salary_min', 'salary_max'], axis=1)
+
+
+def build_rollup(data, salary, dataset, dimensions=None, year=None):
+    """
+    Aggregates a dataset over each dimension, for all years and, when the data has a
+    year column, for every year too. Together with the total these are the grouping
+    sets the analytics charts read: counts come from jobs and mean salaries from
+    salary_sum / salary_count.
+    @param data: DataFrame to summarize.
+    @param salary: Series of salaries aligned with data; missing salaries only count as jobs.
+    @param dataset: Name of the dataset, stored in the dataset column.
+    @param dimensions: Dict of dimension name to column.
+    @param year: Year column, or None when the data has no year.
+    @return: DataFrame with the ROLLUP_COLUMNS columns; year is missing for all-year rows
+    and value is missing for the total.
+    """
+    data = data.reset_index(drop=True)
+    salary = pd.to_numeric(salary, errors='coerce').astype(float).reset_index(drop=True)
+    years = pd.to_numeric(pd.Series(np.asarray(data[year], dtype=object)), errors='coerce') if year else None
+    parts = []
+    for name, column in [('all', None)] + list((dimensions or {}).items()):
+        values, values_salary, values_years = None, salary, years
+        if column is not None:
+            values = data[column].astype(object).astype(str).where(data[column].notna())
+            if name in LIST_DIMENSIONS:
+                # Each item of a list counts the row once, aligned by the row's position
+                values = values.str.split(',').explode().str.strip()
+                values_salary = salary.loc[values.index]
+                values_years = None if years is None else years.loc[values.index]
+        for by_year in ([False, True] if years is not None and name != 'year' else [False]):
+            keys = []
+            if by_year:
+                keys.append(values_years.rename('year'))
+            if values is not None:
+                keys.append(values.rename('value'))
+            part = aggregate(values_salary, keys).reset_index(drop=not keys)
+            parts.append(part.assign(dataset=dataset, dimension=name))
+
+    rollup = pd.concat(parts, ignore_index=True)
+    for column in ('year', 'value'):
+        if column not in rollup.columns:
+            rollup[column] = np.nan
+    rollup['year'] = pd.to_numeric(rollup['year'], errors='coerce').astype('Int64')
+    return rollup[ROLLUP_COLUMNS]
+
+
+def combine_rollups(rollups):
+    """
+    Merges rollups built over disjoint parts of a dataset into the rollup of the whole,
+    since counts and sums add up and minimums and maximums combine.
+    @param rollups: List of DataFrames from build_rollup.
+    @return: DataFrame with the ROLLUP_COLUMNS columns.
+    """
+    rollup = (pd.concat(rollups, ignore_index=True)
+              .groupby(['dataset', 'year', 'dimension', 'value'], dropna=False, sort=False)
+              .agg(jobs=('jobs', 'sum'), salary_count=('salary_count', 'sum'), salary_sum=('salary_sum', 'sum'),
+                   salary_min=('salary_min', 'min'), salary_max=('salary_max', 'max'))
+              .reset_index())
+    return rollup[ROLLUP_COLUMNS]
+
+
+def read_h1b_batches(dataset_path, batch_rows=BATCH_ROWS):
+    """
+    @param dataset_path: Path of the year-partitioned H1B Parquet dataset.
+    @param batch_rows: Rows per batch.
+    @return: Iterator of DataFrames with the H1B_COLUMNS columns.
+    """
+    dataset = ds.dataset(dataset_path, format='parquet', partitioning='hive')
+    for batch in dataset.to_batches(columns=H1B_COLUMNS, batch_size=batch_rows):
+        yield batch.to_pandas()
+
+
+def build_h1b_summaries(dataset_path, bins=HISTOGRAM_BINS, batch_rows=BATCH_ROWS):
+    """
+    Builds the H1B rollup and salary histogram batch by batch, so only one batch of the
+    dataset and the rollup so far are in memory. The histogram bins span the salary
+    range of the finished rollup, so the petitions are read a second time to fill them.
+    @param dataset_path: Path of the H1B Parquet dataset, or None when it has not been scraped.
+    @param bins: Number of equal-width histogram bins.
+    @param batch_rows: Rows per batch.
+    @return: The H1B rollup and histogram DataFrames, as build_rollup and build_histogram return them.
+    """
+    rollup = None
+    for batch in (read_h1b_batches(dataset_path, batch_rows) if dataset_path else []):
+        part = build_rollup(batch, batch['BASE SALARY'], 'h1b', H1B_DIMENSIONS, year='Year')
+        rollup = part if rollup is None else combine_rollups([rollup, part])
+    if rollup is None:
+        empty = pd.DataFrame(columns=H1B_COLUMNS)
+        return build_rollup(empty, empty['BASE SALARY'], 'h1b', H1B_DIMENSIONS, year='Year'), \
+            build_histogram(empty['BASE SALARY'], 'h1b', bins)
+
+    total = rollup[(rollup['dimension'] == 'all') & rollup['year'].isna()].iloc[0]
+    if total['salary_count'] == 0:
+        return rollup, build_histogram(pd.Series(dtype=float), 'h1b', bins)
+    edges = np.histogram_bin_edges([], bins, range=(total['salary_min'], total['salary_max']))
+    counts = np.zeros(bins, dtype=int)
+    for batch in read_h1b_batches(dataset_path, batch_rows):
+        values = pd.to_numeric(batch['BASE SALARY'], errors='coerce').dropna().to_numpy(dtype=float)
+        counts += np.histogram(values, bins=edges)[0]
+    return rollup, pd.DataFrame({'dataset': 'h1b', 'bin_left': edges[:-1], 'bin_right': edges[1:], 'jobs': counts})
+
+
+def build_histogram(salary, dataset, bins=HISTOGRAM_BINS):
+    """
+    @param salary: Series of salaries.
+    @param dataset: Name of the dataset.
+    @param bins: Number of equal-width bins.
+    @return: DataFrame of dataset, bin_left, bin_right and jobs per bin.
+    """
+    values = pd.to_numeric(salary, errors='coerce').dropna().to_numpy(dtype=float)
+    counts, edges = np.histogram(values, bins=bins) if len(values) else ([], [0.0])
+    return pd.DataFrame({'dataset': dataset, 'bin_left': edges[:-1], 'bin_right': edges[1:], 'jobs': counts})
+
+
+def build_summaries(processed, h1b_dataset):
+    """
+    Builds the summary tables behind the analytics tab.
+
+    The rollup holds one grouping per dimension, for all years and per year, plus the
+    totals; it is not the full cube over every combination of dimensions, which the
+    charts never read. Current jobs are summarized over the postings with both a
+    minimum and maximum salary, using their average, as the analytics charts always did.
+    @param processed: Processed DataFrame of job postings.
+    @param h1b_dataset: Path of the H1B Parquet dataset, or None when it has not been scraped.
+    @return: Dict with the 'rollup' and 'salary_histogram' DataFrames.
+    """
+    current = processed.dropna(subset=['min_salary', 'max_salary'])
+    posted = current[['min_salary', 'max_salary']].mean(axis=1)
+    matched = current['h1b_median_salary'].notna()
+    h1b_rollup, h1b_histogram = build_h1b_summaries(h1b_dataset)
+
+    rollups = [
+        h1b_rollup,
+        build_rollup(current, posted, 'current',
+                     {name: column for name, column in CURRENT_DIMENSIONS.items() if column in current.columns}),
+        # Posted salaries and H1B medians of the postings matched to an H1B employer and title
+        build_rollup(current[matched], posted[matched], 'current_h1b_matched'),
+        build_rollup(current[matched], current.loc[matched, 'h1b_median_salary'], 'h1b_matched_median'),
+    ]
+    histograms = [h1b_histogram, build_histogram(posted, 'current')]
+    return {
+        'rollup': pd.concat(rollups, ignore_index=True),
+        'salary_histogram': pd.concat([histogram for histogram in histograms if len(histogram)] or histograms[:1],
+                                      ignore_index=True),
+    }
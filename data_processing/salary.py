@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+
+HOURS_PER_YEAR = 40 * 52
+MONTHS_PER_YEAR = 12
+
+# Values below this are taken to be hourly rates when the listing has no pay period
+HOURLY_THRESHOLD = 200.0
+
+# Share of a single advertised value used as the lower bound of the range
+SINGLE_VALUE_MIN_RATIO = 0.6
+
+SALARY_PATTERN = (r'\$?\s*(?P<low>\d[\d,]*(?:\.\d+)?)\s*(?P<low_k>[Kk])?'
+                  r'(?:\s*[-–]\s*\$?\s*(?P<high>\d[\d,]*(?:\.\d+)?)\s*(?P<high_k>[Kk])?)?')
+HOURLY_PATTERN = r'(?i)per\s+hour|/\s*h(?:ou)?r\b|\bhourly\b'
+MONTHLY_PATTERN = r'(?i)per\s+month|/\s*mo(?:nth)?\b|\bmonthly\b'
+YEARLY_PATTERN = r'(?i)per\s+year|/\s*yr\b|/\s*year\b|\byearly\b|\bannual'
+
+
+def parse_salaries(salary):
+    """
+    Parses raw salary strings into annual minimum and maximum salaries.
+
+    Handles ranges ("$100K - $150K"), single values, K suffixes, thousands separators,
+    hourly, monthly and yearly markers and trailing "(Employer est.)" or
+    "(Glassdoor est.)" tags, all with vectorized string and NumPy operations.
+    A single value becomes the maximum, with SINGLE_VALUE_MIN_RATIO of it as the
+    minimum. Listings without a pay period whose values are below HOURLY_THRESHOLD
+    are treated as hourly.
+    @param salary: Series of raw salary strings.
+    @return: DataFrame with float min_salary and max_salary columns (NaN when the salary
+    cannot be parsed) and a pay_period column ('hourly', 'monthly', 'yearly' or NaN).
+    """
+    # Listings repeat the same salary strings heavily, so each distinct string is parsed
+    # once and the results are broadcast back with the factorized codes. Missing values
+    # get code -1, which selects the NaN appended after the distinct results.
+    codes, uniques = pd.factorize(salary)
+    low, high, pay_period = parse_distinct_salaries(pd.Series(uniques, dtype='string'))
+
+    return pd.DataFrame({
+        'min_salary': np.append(low, np.nan)[codes],
+        'max_salary': np.append(high, np.nan)[codes],
+        'pay_period': np.append(pay_period, np.nan)[codes],
+    }, index=salary.index)
+
+
+def parse_distinct_salaries(salary):
+    """
+    Parses salary strings without missing values; the work behind parse_salaries.
+    @param salary: Series of salary strings of the pandas string dtype.
+    @return: Tuple of annual minimum and maximum float arrays and an object array of pay periods.
+    """
+    parts = salary.str.extract(SALARY_PATTERN)
+
+    low = pd.to_numeric(parts['low'].str.replace(',', '', regex=False), errors='coerce').to_numpy(dtype=float)
+    high = pd.to_numeric(parts['high'].str.replace(',', '', regex=False), errors='coerce').to_numpy(dtype=float)
+    low = np.where(parts['low_k'].notna().to_numpy(), low * 1000, low)
+    high = np.where(parts['high_k'].notna().to_numpy(), high * 1000, high)
+
+    # Single values give only the maximum
+    single = np.isnan(high)
+    high = np.where(single, low, high)
+    low = np.where(single, low * SINGLE_VALUE_MIN_RATIO, low)
+
+    hourly = salary.str.contains(HOURLY_PATTERN, regex=True).to_numpy(dtype=bool)
+    monthly = salary.str.contains(MONTHLY_PATTERN, regex=True).to_numpy(dtype=bool)
+    yearly = salary.str.contains(YEARLY_PATTERN, regex=True).to_numpy(dtype=bool)
+    unmarked = ~(hourly | monthly | yearly)
+    hourly |= unmarked & (high < HOURLY_THRESHOLD)
+
+    multiplier = np.select([hourly, monthly], [HOURS_PER_YEAR, MONTHS_PER_YEAR], default=1)
+    pay_period = np.select([hourly, monthly], ['hourly', 'monthly'], default='yearly').astype(object)
+    pay_period[np.isnan(high)] = np.nan
+
+    return low * multiplier, high * multiplier, pay_period
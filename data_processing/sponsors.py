@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+from dedup import normalize_employer, normalize_text
+
+# Longest run of words from an H1B employer name that is indexed as a key
+MAX_KEY_TOKENS = 8
+
+# A leading run shared by several H1B employers needs this many characters to match, so
+# "amazon" finds "amazon com services" but "acme" does not pick one of many Acme companies
+MIN_SHARED_PHRASE_CHARS = 6
+
+# Runs made only of these words never match on their own, since they name no employer
+GENERIC_WORDS = frozenset({
+    'a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'the', 'to', 'us', 'usa', 'america', 'american',
+    'national', 'international', 'global', 'group', 'holdings', 'partners', 'associates', 'enterprises',
+    'services', 'service', 'solutions', 'systems', 'technologies', 'technology', 'tech', 'data',
+    'software', 'consulting', 'management', 'digital', 'information', 'it', 'labs', 'network', 'networks',
+})
+
+H1B_COLUMNS = ['EMPLOYER', 'JOB TITLE', 'BASE SALARY', 'Year']
+
+
+def leading_phrases(key):
+    """
+    @param key: Normalized employer name.
+    @return: The runs of up to MAX_KEY_TOKENS words the name starts with, with or without a
+    leading "the", that are shorter than the full name and not made only of GENERIC_WORDS.
+    """
+    words = key.split(' ')
+    phrases = [' '.join(words[:size]) for size in range(1, min(len(words) - 1, MAX_KEY_TOKENS) + 1)
+               if not GENERIC_WORDS.issuperset(words[:size])]
+    if words[0] == 'the' and len(words) > 1:
+        phrases += [' '.join(words[1:])] + leading_phrases(' '.join(words[1:]))
+    return phrases
+
+
+def build_employer_table(h1b):
+    """
+    Summarizes the H1B petitions per normalized employer name.
+    @param h1b: DataFrame of H1B petitions with EMPLOYER and Year columns.
+    @return: DataFrame indexed by employer_key with h1b_petitions and h1b_last_year columns.
+    """
+    keys = normalize_employer(h1b['EMPLOYER'])
+    # Year comes back categorical from the hive partitioning
+    years = pd.to_numeric(np.asarray(h1b['Year'], dtype=object), errors='coerce')
+    table = (pd.DataFrame({'employer_key': keys, 'year': years})
+             .groupby('employer_key')['year'].agg(h1b_petitions='size', h1b_last_year='max'))
+    return table[table.index != '']
+
+
+def build_phrase_table(employers):
+    """
+    Maps the leading word runs of H1B employer names to the employer they most likely refer to.
+
+    The runs each name starts with are its phrases, so a posting by "Google" finds
+    "google cloud" through the phrase "google", while "Services" does not find "amazon
+    com services". Phrases of only generic words are skipped. A phrase shared by several
+    employers is kept only from MIN_SHARED_PHRASE_CHARS characters and maps to the one
+    with the most petitions.
+    @param employers: Employer table from build_employer_table.
+    @return: Series of employer keys indexed by phrase.
+    """
+    phrases = pd.DataFrame({
+        'phrase': [leading_phrases(key) for key in employers.index],
+        'employer_key': employers.index,
+        'petitions': employers['h1b_petitions'].to_numpy(),
+    }).explode('phrase').dropna(subset=['phrase'])
+    shared = phrases['phrase'].map(phrases['phrase'].value_counts()) > 1
+    phrases = phrases[~shared | (phrases['phrase'].str.len() >= MIN_SHARED_PHRASE_CHARS)]
+    phrases = phrases.sort_values(['petitions', 'employer_key'], ascending=[False, True], kind='stable')
+    return phrases.drop_duplicates('phrase').set_index('phrase')['employer_key']
+
+
+def enrich_with_h1b(data, h1b):
+    """
+    Adds H1B sponsorship columns to the job postings.
+
+    Posting employers are matched to H1B employers on their normalized names. Names
+    without an exact match fall back to the H1B employer whose name starts with the
+    name, as described in build_phrase_table. Both joins are hash merges over the
+    distinct keys.
+    @param data: Processed DataFrame with employer and job_title columns.
+    @param h1b: DataFrame of H1B petitions with EMPLOYER, JOB TITLE, BASE SALARY and Year columns.
+    @return: The postings with h1b_sponsor, h1b_petitions, h1b_median_salary and h1b_last_year
+    columns. The median salary is for the same employer and normalized job title.
+    """
+    employers = build_employer_table(h1b)
+    phrases = build_phrase_table(employers)
+
+    keys = normalize_employer(data['employer'])
+    exact = keys.where(keys.isin(employers.index))
+    fuzzy = keys.map(phrases)
+    matched = pd.Series(np.where(exact.notna(), exact, fuzzy), index=keys.index).where(keys != '')
+
+    salaries = (pd.DataFrame({'employer_key': normalize_employer(h1b['EMPLOYER']),
+                              'title_key': normalize_text(h1b['JOB TITLE']),
+                              'h1b_median_salary': pd.to_numeric(h1b['BASE SALARY'], errors='coerce')})
+                .groupby(['employer_key', 'title_key'])['h1b_median_salary'].median())
+
+    lookup = pd.DataFrame({'employer_key': matched.to_numpy(),
+                           'title_key': normalize_text(data['job_title']).to_numpy()})
+    stats = lookup.join(employers, on='employer_key').join(salaries, on=['employer_key', 'title_key'])
+
+    data = data.copy()
+    data['h1b_sponsor'] = matched.notna().to_numpy()
+    data['h1b_petitions'] = stats['h1b_petitions'].fillna(0).astype(int).to_numpy()
+    data['h1b_median_salary'] = stats['h1b_median_salary'].to_numpy(dtype=float)
+    data['h1b_last_year'] = stats['h1b_last_year'].astype('Int64').to_numpy()
+    print(f"Matched {data['h1b_sponsor'].sum()} of {len(data)} postings to H1B sponsors "
+          f"({(exact.notna()).sum()} exact, {(exact.isna() & matched.notna()).sum()} fuzzy)")
+    return data
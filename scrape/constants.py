@@ -4,3 +4,6 @@ H1B_SCRAPED = "scrape/h1b/scrape_h1b.csv"
 LINKEDIN_CLEANED_DATA = "scrape/linkedin/clean_linkedin.csv"
 AGGREGATED_DATA = "scrape/data_processing/aggregated_data.csv"
 PROCESSED_AGGREGATED_DATA = "scrape/data_processing/processed_aggregated_data.csv"
+RESPONSE_CACHE = "scrape/cache/responses.sqlite"
+LINKEDIN_INDEX = "scrape/linkedin/linkedin_job_index.csv"
+H1B_DATASET = "scrape/h1b/h1b_dataset"
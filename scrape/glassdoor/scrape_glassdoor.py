@@ -1,54 +1,288 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from lxml import etree, html
+import requests
+import queue
+import threading
 import time
 import pandas as pd
 
+JOBS_LIST_CLASS = "JobsList_jobsList__Ey2Vo"
+JOB_FIELDS = {
+    "name-of-company": ("div", "EmployerProfile_profileContainer__d5rMb"),
+    "name-of-job": ("a", "JobCard_seoLink__WdqHZ"),
+    "location": ("div", "JobCard_location__N_iYE"),
+    "salary": ("div", "JobCard_salaryEstimate___m9kY"),
+}
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/107.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9'
+}
 
-def scrape_glassdoor_jobs(technologies, locations, chromedriver_path, output_csv_path):
+
+class HttpPageFetcher:
+    """
+    Fetches Glassdoor pages over a pooled HTTP session without starting a browser.
+    """
+
+    def __init__(self, session=None, timeout=10):
+        """
+        Initializes the fetcher.
+
+        Args:
+            session (requests.Session): Optional session to reuse, with its own adapters,
+                instead of creating a pooled one.
+            timeout (float): Request timeout in seconds.
+        """
+        self.timeout = timeout
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_maxsize=4))
+        self.session = session
+        self.session.headers.update(HEADERS)
+
+    def fetch(self, url):
+        """
+        Fetches the HTML of a page.
+
+        Args:
+            url (str): URL of the page.
+
+        Returns:
+            str: The page source.
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        return response.text
+
+    def close(self):
+        """Closes the underlying session."""
+        self.session.close()
+
+
+class SeleniumPageFetcher:
+    """
+    Fetches Glassdoor pages through a WebDriver, for pages that need JavaScript to render.
+    """
+
+    def __init__(self, driver_factory, page_timeout=10):
+        """
+        Initializes the fetcher. The WebDriver is started on the first fetch.
+
+        Args:
+            driver_factory (callable): Returns a new WebDriver.
+            page_timeout (float): Maximum seconds to wait for the job list to appear.
+        """
+        self.driver_factory = driver_factory
+        self.page_timeout = page_timeout
+        self.driver = None
+
+    def fetch(self, url):
+        """
+        Loads a page and returns its rendered HTML.
+
+        Args:
+            url (str): URL of the page.
+
+        Returns:
+            str: The page source.
+        """
+        if self.driver is None:
+            self.driver = self.driver_factory()
+        return load_page(self.driver, url, self.page_timeout)
+
+    def close(self):
+        """Quits the WebDriver if it was started."""
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+def class_xpath(tag, class_name):
+    """Returns an XPath step matching tag elements whose class list contains class_name."""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+# Compiled selectors for the lxml parser backend, mirroring extract_job_data
+JOBS_LIST_XPATH = etree.XPath(f"(//{class_xpath('ul', JOBS_LIST_CLASS)})[1]//li")
+JOBS_LIST_PRESENT_XPATH = etree.XPath(f"boolean(//{class_xpath('ul', JOBS_LIST_CLASS)})")
+JOB_FIELD_XPATHS = {field: etree.XPath(f"(.//{class_xpath(tag, class_name)})[1]")
+                    for field, (tag, class_name) in JOB_FIELDS.items()}
+
+
+def scrape_glassdoor_jobs(technologies, locations, chromedriver_path, output_csv_path, cache=None,
+                          workers=1, page_delay=5, page_timeout=10, driver_factory=None,
+                          fetcher_factory=HttpPageFetcher, browser_fallback=True, parser='lxml'):
     """
     Scrapes job postings from Glassdoor for specified technologies and locations.
 
+    A pool of workers pulls (tech, location) tasks from a shared queue. Pages are
+    fetched with fetcher_factory's fetcher, plain HTTP by default, and only loaded in a
+    WebDriver when the job list is missing from the fetched HTML. The results are
+    merged in task order once all workers finish. A search that fails is logged and
+    skipped, and the CSV is only written when every search succeeded.
+
     Args:
         technologies (list): List of technologies to scrape jobs for.
         locations (dict): Dictionary of locations with corresponding Glassdoor location IDs.
         chromedriver_path (str): Path to the ChromeDriver executable.
         output_csv_path (str): Path to save the scraped data as a CSV file.
+        cache (ResponseCache): Optional persistent cache for search result pages.
+        workers (int): Number of workers to run in parallel.
+        page_delay (float): Seconds each worker pauses after fetching a page.
+        page_timeout (float): Maximum seconds to wait for a page or its job list.
+        driver_factory (callable): Returns a new WebDriver; defaults to headless Chrome.
+        fetcher_factory (callable): Returns the primary fetcher, an object with fetch(url) and close().
+        browser_fallback (bool): Whether to retry pages without a job list in a WebDriver.
+        parser (str): HTML parser backend, 'lxml' (compiled selectors) or 'bs4'.
+
+    Returns:
+        list: (tech, location) of the searches that failed, empty when the CSV was written.
     """
+    if driver_factory is None:
+        def driver_factory():
+            return create_driver(chromedriver_path)
+
+    searches = [(tech, location, location_id)
+                for tech in technologies for location, location_id in locations.items()]
+    tasks = queue.Queue()
+    for position, search in enumerate(searches):
+        tasks.put((position, *search))
+    # Stays None for searches that failed
+    results = [None] * len(searches)
+
+    def worker():
+        fetcher = fetcher_factory()
+        fallback = SeleniumPageFetcher(driver_factory, page_timeout)
+        try:
+            while True:
+                try:
+                    position, tech, location, location_id = tasks.get_nowait()
+                except queue.Empty:
+                    return
 
-    # Initialize the Selenium WebDriver
-    service = Service(chromedriver_path)
-    driver = webdriver.Chrome(service=service)
+                try:
+                    # Generate the target URL
+                    target_url = generate_url(tech, location, location_id)
 
-    job_data = []
+                    page_source = cache.get(target_url) if cache else None
+                    if page_source is None:
+                        print(f"Scraping {tech} jobs in {location} with URL: {target_url}...")
 
-    for tech in technologies:
-        for location, location_id in locations.items():
-            # Generate the target URL
-            target_url = generate_url(tech, location, location_id)
+                        page_source, jobs = fetch_job_list(target_url, tech, fetcher,
+                                                           fallback if browser_fallback else None, parser)
 
-            print(f"Scraping {tech} jobs in {location} with URL: {target_url}...")
+                        # Captcha, blocked or timed out pages are fetched again next time
+                        if cache and jobs is not None:
+                            cache.set(target_url, page_source, 'glassdoor')
 
-            # Scrape the webpage
-            driver.get(target_url)
-            driver.maximize_window()  # Maximizing the browser window is optional
-            time.sleep(2)  # Wait for the page to load
+                        time.sleep(page_delay)  # Pause before scraping the next page
+                    else:
+                        print(f"Using cached {tech} jobs in {location}")
+                        jobs = parse_job_list(page_source, tech, parser)
 
-            # Parse the page content
-            soup = BeautifulSoup(driver.page_source, 'html.parser')
-            all_jobs = extract_job_data(soup, tech)
+                    # Captcha, blocked or timed out pages leave the search failed
+                    if jobs is None:
+                        print(f"No job list for {tech} jobs in {location}")
+                    else:
+                        results[position] = jobs
+                except Exception as e:
+                    print(f"Error scraping {tech} jobs in {location}: {e}")
+        finally:
+            fetcher.close()
+            fallback.close()
 
-            # Append job data to the list
-            job_data.extend(all_jobs)
+    threads = [threading.Thread(target=worker) for _ in range(max(1, workers))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
 
-            time.sleep(5)  # Pause before scraping the next page
+    failed = [(tech, location) for (tech, location, _), jobs in zip(searches, results) if jobs is None]
+    if failed:
+        print(f"{len(failed)} of {len(searches)} Glassdoor searches failed, "
+              f"keeping the previous {output_csv_path}: {failed}")
+        return failed
+
+    job_data = [job for jobs in results for job in jobs]
 
     # Convert the job data to a DataFrame and save as a CSV file
     pd.DataFrame(job_data).to_csv(
         output_csv_path, index=False, encoding='utf-8')
+    return failed
 
-    # Close the WebDriver
-    driver.close()
+
+def fetch_job_list(url, tech, fetcher, fallback=None, parser='lxml'):
+    """
+    Fetches a search page and parses its job list, loading it in the fallback fetcher
+    when the request fails or the fetched HTML has no job list.
+
+    Args:
+        url (str): URL of the search page.
+        tech (str): Technology associated with the job listings.
+        fetcher: Primary fetcher, an object with fetch(url).
+        fallback: Optional fetcher for pages the primary one could not get.
+        parser (str): HTML parser backend, 'lxml' or 'bs4'.
+
+    Returns:
+        tuple: The page source and its list of job dictionaries, or None if it has no job list.
+    """
+    try:
+        page_source = fetcher.fetch(url)
+        jobs = parse_job_list(page_source, tech, parser)
+        if jobs is not None or fallback is None:
+            return page_source, jobs
+        print(f"No job list in HTML at {url}, loading in browser")
+    except requests.RequestException as e:
+        if fallback is None:
+            raise
+        print(f"Request for {url} failed ({e}), loading in browser")
+    page_source = fallback.fetch(url)
+    return page_source, parse_job_list(page_source, tech, parser)
+
+
+def create_driver(chromedriver_path, headless=True):
+    """
+    Creates a Chrome WebDriver.
+
+    Args:
+        chromedriver_path (str): Path to the ChromeDriver executable.
+        headless (bool): Whether to run Chrome without a visible window.
+
+    Returns:
+        webdriver.Chrome: The started WebDriver.
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    return webdriver.Chrome(service=Service(chromedriver_path), options=options)
+
+
+def load_page(driver, url, timeout):
+    """
+    Loads a Glassdoor search page and waits for its job list to appear.
+
+    Args:
+        driver (WebDriver): WebDriver to load the page with.
+        url (str): URL of the search page.
+        timeout (float): Maximum seconds to wait for the job list.
+
+    Returns:
+        str: The page source, which may lack a job list if the wait timed out.
+    """
+    driver.get(url)
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CLASS_NAME, JOBS_LIST_CLASS)))
+    except TimeoutException:
+        print(f"Timed out waiting for job list at {url}")
+    return driver.page_source
 
 
 def generate_url(tech, location, location_id):
@@ -68,6 +302,44 @@ def generate_url(tech, location, location_id):
     return f"https://www.glassdoor.com/Job/{formatted_location}-{formatted_tech}-jobs-SRCH_IL.0,{len(formatted_location)}_{location_id}_KO{len(formatted_location) + 1},{len(formatted_location) + 1 + len(formatted_tech)}.htm?clickSource=searchBox"
 
 
+def parse_job_list(page_source, tech, parser='lxml'):
+    """
+    Parses the job cards of a Glassdoor search page.
+
+    The 'lxml' backend parses the page once and reads every field with compiled XPath
+    selectors; the 'bs4' backend uses extract_job_data.
+
+    Args:
+        page_source (bytes or str): HTML of the search page.
+        tech (str): Technology associated with the job listings.
+        parser (str): HTML parser backend, 'lxml' or 'bs4'.
+
+    Returns:
+        list: List of dictionaries containing job data, or None if the page has no job list.
+    """
+    if parser == 'lxml':
+        try:
+            document = html.fromstring(page_source)
+        except etree.ParserError:
+            return None
+        if not JOBS_LIST_PRESENT_XPATH(document):
+            return None
+        jobs = []
+        for job in JOBS_LIST_XPATH(document):
+            record = {}
+            for field, xpath in JOB_FIELD_XPATHS.items():
+                element = xpath(job)
+                record[field] = element[0].text_content() if element else None
+            record["tech"] = tech
+            jobs.append(record)
+        return jobs
+
+    soup = BeautifulSoup(page_source, 'html.parser')
+    if not soup.find("ul", {"class": JOBS_LIST_CLASS}):
+        return None
+    return extract_job_data(soup, tech)
+
+
 def extract_job_data(soup, tech):
     """
     Extracts job data from a BeautifulSoup object.
@@ -80,16 +352,13 @@ def extract_job_data(soup, tech):
         list: List of dictionaries containing job data.
     """
     jobs = []
-    all_jobs_container = soup.find("ul", {"class": "JobsList_jobsList__Ey2Vo"})
+    all_jobs_container = soup.find("ul", {"class": JOBS_LIST_CLASS})
     if all_jobs_container:
         for job in all_jobs_container.find_all("li"):
-            jobs.append({
-                "name-of-company": extract_text(job, "div", {"class": "EmployerProfile_profileContainer__d5rMb"}),
-                "name-of-job": extract_text(job, "a", {"class": "JobCard_seoLink__WdqHZ"}),
-                "location": extract_text(job, "div", {"class": "JobCard_location__N_iYE"}),
-                "salary": extract_text(job, "div", {"class": "JobCard_salaryEstimate___m9kY"}),
-                "tech": tech
-            })
+            record = {field: extract_text(job, tag, {"class": class_name})
+                      for field, (tag, class_name) in JOB_FIELDS.items()}
+            record["tech"] = tech
+            jobs.append(record)
     return jobs
 
 
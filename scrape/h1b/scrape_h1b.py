@@ -1,24 +1,54 @@
 import pandas as pd
 from bs4 import BeautifulSoup
-import urllib.request
+from lxml import etree, html
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
 import urllib.parse
+import datetime
 import logging
+import os
+import re
+import time
+
+H1B_URL = "https://h1bdata.info/index.php"
+
 
 class HTMLTableParser:
     """
     A class to parse HTML tables from a given URL.
     """
 
-    def __init__(self):
-        """Initializes the HTMLTableParser with a logger."""
+    def __init__(self, cache=None, timeout=30, retries=3, backoff=1.0, pool_size=10):
+        """
+        Initializes the HTMLTableParser with a logger and a pooled HTTP session.
+
+        Args:
+            cache (ResponseCache): Optional persistent cache for fetched pages.
+            timeout (float): Per-request timeout in seconds.
+            retries (int): Number of retries after a failed request.
+            backoff (float): Delay before the first retry; doubled for every further retry.
+            pool_size (int): Number of pooled connections per host.
+        """
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache = cache
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
-    def parse(self, url):
+    def parse(self, url, ttl=None):
         """
         Parses tables from a given URL into a list of pandas DataFrames.
 
         Args:
             url (str): URL of the webpage to scrape tables from.
+            ttl (float): Cache time to live for this page; None uses the H1B default.
 
         Returns:
             list: A list of pandas DataFrames, each representing an HTML table.
@@ -26,29 +56,137 @@ class HTMLTableParser:
         try:
             if not isinstance(url, str):
                 raise ValueError("URL must be a string")
-            soup = self.read_url(url)
-            return self.obtain_tables(soup)
+            return self.fetch_tables(url, ttl)
         except Exception as e:
             self.logger.error(f"Error parsing URL {url}: {e}")
             return []
 
-    def read_url(self, url):
+    def fetch_tables(self, url, ttl=None, columns=None):
         """
-        Reads HTML content from a URL.
+        Fetches a page and parses its tables, using the response cache when one is set.
+
+        A fetched page is only cached when it parses to at least one table, so block,
+        error and empty pages are fetched again instead of being served for the TTL.
+
+        Args:
+            url (str): URL to fetch.
+            ttl (float): Cache time to live for this page; None uses the H1B default.
+            columns (list): Optional columns a table must have to be returned.
+
+        Returns:
+            list: A list of pandas DataFrames.
+
+        Raises:
+            requests.RequestException: If the page could not be fetched after all retries.
+        """
+        page_source = self.cache.get(url) if self.cache else None
+        cached = page_source is not None
+        if not cached:
+            page_source = self.fetch_page(url)
+        tables = [table for table in self.parse_tables(page_source)
+                  if columns is None or set(columns) <= set(table.columns)]
+        if tables and self.cache and not cached:
+            self.cache.set(url, page_source, 'h1b', ttl=ttl)
+        return tables
+
+    def fetch_page(self, url):
+        """
+        Fetches the raw HTML of a URL, retrying with exponential backoff.
+
+        Connection errors, timeouts, 429 and 5xx responses are retried; other HTTP
+        errors fail immediately.
+
+        Args:
+            url (str): URL to fetch.
+
+        Returns:
+            bytes: The page source.
+
+        Raises:
+            requests.RequestException: If the page could not be fetched after all retries.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+                if response.status_code == 429 or response.status_code >= 500:
+                    response.raise_for_status()
+                break
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                self.logger.warning(f"Retrying {url} in {delay:.1f}s after error: {e}")
+                time.sleep(delay)
+        response.raise_for_status()
+        return response.content
+
+    def read_page(self, url):
+        """
+        Reads the raw HTML of a URL, from the response cache when it holds the page.
+        Pages are only stored in the cache by fetch_tables.
 
         Args:
             url (str): URL to read.
 
         Returns:
-            BeautifulSoup: BeautifulSoup object representing the webpage content.
+            bytes: The page source, empty if the page could not be read.
         """
         try:
-            response = urllib.request.urlopen(url)
-            page_source = response.read()
-            return BeautifulSoup(page_source, 'lxml')
+            page_source = self.cache.get(url) if self.cache else None
+            return page_source if page_source is not None else self.fetch_page(url)
         except Exception as e:
             self.logger.error(f"Error reading URL {url}: {e}")
-            return BeautifulSoup('', 'lxml')
+            return b''
+
+    def read_url(self, url):
+        """
+        Reads HTML content from a URL, using the response cache when one is set.
+
+        Args:
+            url (str): URL to read.
+
+        Returns:
+            BeautifulSoup: BeautifulSoup object representing the webpage content.
+        """
+        return BeautifulSoup(self.read_page(url), 'lxml')
+
+    def parse_tables(self, page_source):
+        """
+        Parses every non-empty table of a page in a single pass over its rows.
+
+        Cells are appended straight into per-column lists, so each table is walked once
+        and turned into a DataFrame without intermediate row lists. Rows whose cell
+        count does not match the header are skipped.
+
+        Args:
+            page_source (bytes or str): HTML of the page.
+
+        Returns:
+            list: A list of pandas DataFrames.
+        """
+        try:
+            document = html.fromstring(page_source)
+        except etree.ParserError:
+            return []
+        tables = []
+        for table in document.iter('table'):
+            rows = table.iter('tr')
+            first = next(rows, None)
+            if first is None:
+                continue
+            header = [th.text_content().strip() for th in first.iterfind('th')]
+            if not header:
+                continue
+            columns = [[] for _ in header]
+            for tr in rows:
+                cells = tr.findall('td')
+                if len(cells) != len(header):
+                    continue
+                for column, td in zip(columns, cells):
+                    column.append(td.text_content().strip())
+            if columns[0]:
+                tables.append(pd.DataFrame(dict(zip(header, columns))))
+        return tables
 
     def obtain_tables(self, soup):
         """
@@ -60,7 +198,8 @@ class HTMLTableParser:
         Returns:
             list: A list of pandas DataFrames.
         """
-        return [self.parse_html_table(table) for table in soup.find_all('table') if not self.parse_html_table(table).empty]
+        tables = (self.parse_html_table(table) for table in soup.find_all('table'))
+        return [table for table in tables if not table.empty]
 
     def parse_html_table(self, table):
         """
@@ -78,15 +217,91 @@ class HTMLTableParser:
         return pd.DataFrame(data, columns=header)
 
 
+class H1BParquetSink:
+    """
+    Writes scraped H1B tables into a Parquet dataset partitioned by year.
+
+    Each (year, job) page becomes one file at <path>/Year=<year>/<job>.parquet with a
+    fixed schema, so readers can prune partitions with a filter on Year.
+    """
+
+    SCHEMA = pa.schema([
+        ('EMPLOYER', pa.string()),
+        ('JOB TITLE', pa.string()),
+        ('BASE SALARY', pa.int64()),
+        ('LOCATION', pa.string()),
+        ('SUBMIT DATE', pa.timestamp('ns')),
+        ('START DATE', pa.timestamp('ns')),
+    ])
+
+    def __init__(self, path):
+        """
+        Initializes the sink.
+
+        Args:
+            path (str): Root directory of the Parquet dataset.
+        """
+        self.path = path
+
+    def write(self, year, job, frame):
+        """
+        Writes the typed rows of one (year, job) page, replacing any earlier file for it.
+
+        Args:
+            year (int): Year the rows were scraped for.
+            job (str): Job title the rows were scraped for.
+            frame (pd.DataFrame): Rows with the columns of SCHEMA.
+        """
+        directory = os.path.join(self.path, f"Year={year}")
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_pandas(frame.reindex(columns=self.SCHEMA.names),
+                                     schema=self.SCHEMA, preserve_index=False)
+        file_name = re.sub(r'[^0-9A-Za-z]+', '-', job).strip('-').lower() or 'all'
+        target = os.path.join(directory, f"{file_name}.parquet")
+        pq.write_table(table, target + '.tmp')
+        os.replace(target + '.tmp', target)
+
+
 class H1B_Scraper:
     """
     A class to scrape H1B visa data for specific job titles and years.
     """
 
-    def __init__(self):
-        """Initializes the H1B_Scraper with an HTMLTableParser and a logger."""
-        self.parser = HTMLTableParser()
+    def __init__(self, cache=None, max_workers=1, timeout=30, retries=3, backoff=1.0, base_url=H1B_URL):
+        """
+        Initializes the H1B_Scraper with an HTMLTableParser and a logger.
+
+        Args:
+            cache (ResponseCache): Optional persistent cache for fetched pages.
+                Pages for past years are cached indefinitely.
+            max_workers (int): Maximum number of (year, job) pages fetched at once.
+            timeout (float): Per-request timeout in seconds.
+            retries (int): Number of retries after a failed request.
+            backoff (float): Delay before the first retry; doubled for every further retry.
+            base_url (str): URL of the h1bdata.info search page.
+        """
+        self.max_workers = max(1, max_workers)
+        self.base_url = base_url
+        self.parser = HTMLTableParser(cache, timeout, retries, backoff, pool_size=self.max_workers)
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.failures = []
+
+    @staticmethod
+    def convert_types(df):
+        """
+        Converts the H1B columns to their typed representations in place.
+
+        BASE SALARY becomes a nullable integer and SUBMIT DATE / START DATE become
+        datetimes; values that cannot be converted become missing.
+
+        Args:
+            df (pd.DataFrame): DataFrame of scraped H1B rows.
+        """
+        if 'BASE SALARY' in df.columns:
+            H1B_Scraper.str2int(df, 'BASE SALARY')
+        for column in ('SUBMIT DATE', 'START DATE'):
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], format='%m/%d/%Y', errors='coerce')
 
     @staticmethod
     def str2int(df, column):
@@ -102,32 +317,85 @@ class H1B_Scraper:
         except Exception as e:
             logging.error(f"Error converting string to int in column {column}: {e}")
 
-    def scrape(self, years, jobs):
+    def scrape(self, years, jobs, sink=None):
         """
         Scrapes H1B data for given years and job titles.
 
+        Pages are fetched by a pool of up to max_workers threads. Pairs that still fail
+        after all retries, or whose page has no table with the H1B columns, are left out
+        of the result and recorded in self.failures.
+
+        With a sink, each page is typed and handed to sink.write(year, job, frame) as
+        soon as it is parsed and nothing is accumulated, so memory stays flat as years
+        and job titles are added.
+
         Args:
             years (list or tuple): Years to scrape data for.
             jobs (list or tuple): Job titles to scrape data for.
+            sink (H1BParquetSink): Optional sink to stream pages into.
 
         Returns:
-            pd.DataFrame: DataFrame containing the scraped H1B data.
+            pd.DataFrame: DataFrame containing the scraped H1B data, or None with a sink.
         """
         if not isinstance(years, (list, tuple)):
             raise TypeError("years should be list or tuple")
         if not isinstance(jobs, (list, tuple)):
             raise TypeError("jobs should be list or tuple")
 
-        all_data = pd.DataFrame()
-        for year in years:
-            for job in jobs:
-                url = f"https://h1bdata.info/index.php?em=&job={urllib.parse.quote_plus(job)}&city=&year={year}"
-                print(f"Scraping URL: {url} for year {year} and job {job}")
-                tables = self.parser.parse(url)
-                for table in tables:
-                    self.str2int(table, 'BASE SALARY')
-                    table['Year'] = year
-                    all_data = pd.concat([all_data, table], ignore_index=True)
+        pairs = [(year, job) for year in years for job in jobs]
+        self.failures = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda pair: self.scrape_page(*pair, sink), pairs))
 
+        frames = [table for tables in results for table in tables]
+        self.report_failures()
+
+        if sink is not None:
+            return None
+        if not frames:
+            return pd.DataFrame()
+        all_data = pd.concat(frames, ignore_index=True)
+        self.convert_types(all_data)
         return all_data
 
+    def scrape_page(self, year, job, sink=None):
+        """
+        Scrapes the tables for one year and job title.
+
+        Args:
+            year (int): Year to scrape data for.
+            job (str): Job title to scrape data for.
+            sink (H1BParquetSink): Optional sink that receives the typed page instead.
+
+        Returns:
+            list: DataFrames with a Year column, empty if the page failed or went to the sink.
+        """
+        # Filings for past years are final, so their pages never need refetching.
+        ttl = float('inf') if int(year) < datetime.date.today().year else None
+        url = f"{self.base_url}?em=&job={urllib.parse.quote_plus(job)}&city=&year={year}"
+        print(f"Scraping URL: {url} for year {year} and job {job}")
+        try:
+            tables = self.parser.fetch_tables(url, ttl, H1BParquetSink.SCHEMA.names)
+            if not tables:
+                raise ValueError("no table with the H1B columns")
+        except Exception as e:
+            self.logger.error(f"Giving up on year {year} and job {job}: {e}")
+            self.failures.append((year, job, str(e)))
+            return []
+        if sink is not None:
+            page = pd.concat(tables, ignore_index=True)
+            self.convert_types(page)
+            sink.write(year, job, page)
+            return []
+        for table in tables:
+            table['Year'] = year
+        return tables
+
+    def report_failures(self):
+        """Prints the (year, job) pairs that could not be scraped in the last run."""
+        if not self.failures:
+            return
+        print(f"Failed to scrape {len(self.failures)} (year, job) pairs:")
+        for year, job, error in self.failures:
+            print(f"  {year} {job}: {error}")
+
@@ -1,40 +1,346 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from lxml import etree, html
 import pandas as pd
 import urllib.parse
+import threading
+import time
+import os
+from concurrent.futures import ThreadPoolExecutor
 
+BASE_URL = 'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?'
+JOB_POSTING_URL = 'https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/'
+JOB_DETAIL_FIELDS = ["company", "job-title", "level", "employment type"]
+# Fields matching a stored row without a job ID to a fetched posting
+MATCH_FIELDS = ["company", "job-title", "level"]
 
-def scrape_linkedin_jobs(job_roles, pages=1):
+
+def class_xpath(tag, class_name):
+    """Returns an XPath step matching tag elements whose class list contains class_name."""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+# Compiled selectors for the lxml parser backend, mirroring the BeautifulSoup extractors
+JOB_IDS_XPATH = etree.XPath(f"//li/descendant::{class_xpath('div', 'base-card')}[1]/@data-entity-urn")
+COMPANY_XPATH = etree.XPath(f"(((//{class_xpath('div', 'top-card-layout__card')})[1]//a)[1]//img)[1]/@alt")
+JOB_TITLE_XPATH = etree.XPath(f"((//{class_xpath('div', 'top-card-layout__entity-info')})[1]//a)[1]")
+CRITERIA_XPATH = etree.XPath(f"(//{class_xpath('ul', 'description__job-criteria-list')})[1]//li")
+CRITERIA_TEXT_XPATH = etree.XPath(f".//{class_xpath('span', 'description__job-criteria-text--criteria')}")
+
+
+class RateLimiter:
+    """
+    A thread-safe limiter that spaces out requests to a single host.
+    """
+
+    def __init__(self, rate=None):
+        """
+        Initializes the limiter.
+
+        Args:
+        rate (float): Maximum requests per second. None or 0 disables limiting.
+        """
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Blocks until the next request slot is available."""
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class LinkedInFetcher:
+    """
+    Fetches LinkedIn pages through a pooled HTTP session with per-host rate limiting.
+    """
+
+    def __init__(self, max_workers=1, rate_limit=None, session=None, cache=None):
+        """
+        Initializes the fetcher.
+
+        Args:
+        max_workers (int): Maximum number of requests in flight at once.
+        rate_limit (float): Maximum requests per second per host. None disables limiting.
+        session (requests.Session): Optional session to reuse instead of creating one.
+        cache (ResponseCache): Optional persistent cache for job posting pages.
+        """
+        self.max_workers = max(1, max_workers)
+        self.rate_limit = rate_limit
+        self.session = session or create_session(self.max_workers)
+        self.cache = cache
+        self.limiters = {}
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.started = time.monotonic()
+
+    def get(self, url):
+        """
+        Performs a rate-limited GET request through the pooled session.
+
+        Args:
+        url (str): URL to fetch.
+
+        Returns:
+        requests.Response: The HTTP response.
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            limiter = self.limiters.setdefault(host, RateLimiter(self.rate_limit))
+            self.request_count += 1
+        limiter.wait()
+        return self.session.get(url, headers=get_headers())
+
+    def get_cached(self, url):
+        """
+        Returns the body of a URL, served from the response cache when possible.
+
+        Args:
+        url (str): URL to fetch.
+
+        Returns:
+        bytes: The response body.
+        """
+        if self.cache is None:
+            return self.get(url).content
+        body = self.cache.get(url, get_headers())
+        if body is None:
+            response = self.get(url)
+            body = response.content
+            if response.ok:
+                self.cache.set(url, body, 'linkedin', get_headers())
+        return body
+
+    def requests_per_second(self):
+        """Returns the average request rate since the fetcher was created."""
+        elapsed = time.monotonic() - self.started
+        return self.request_count / elapsed if elapsed > 0 else 0.0
+
+    def close(self):
+        """Closes the underlying session."""
+        self.session.close()
+
+
+def create_session(pool_size=10):
+    """
+    Creates a requests session whose connection pool can hold pool_size connections per host.
+
+    Args:
+    pool_size (int): Number of pooled connections per host.
+
+    Returns:
+    requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def scrape_linkedin_jobs(job_roles, pages=1, max_workers=1, rate_limit=None,
+                         base_url=BASE_URL, job_url=JOB_POSTING_URL, cache=None, parser='lxml'):
     """
     Scrapes job postings from LinkedIn for given job roles.
 
+    Job IDs are discovered for all roles in parallel and deduplicated before any
+    detail page is requested. Job detail pages are then fetched concurrently through
+    a shared, pooled session when max_workers is greater than 1. The returned
+    DataFrame keeps the discovery order.
+
     Args:
     job_roles (list): A list of job roles to search for.
-    pages (int): Number of pages to scrape for each job role.
+    pages (int): Maximum number of pages to scrape for each job role.
+    max_workers (int): Maximum number of requests in flight at once.
+    rate_limit (float): Maximum requests per second per host. None disables limiting.
+    base_url (str): The base URL for LinkedIn job search.
+    job_url (str): The base URL for LinkedIn job postings.
+    cache (ResponseCache): Optional persistent cache for job posting pages.
+    parser (str): HTML parser backend, 'lxml' (compiled selectors) or 'bs4'.
 
     Returns:
     DataFrame: A pandas DataFrame containing details of the job postings.
     """
-    base_url = 'https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?'
-    job_details = []
-
-    for role in job_roles:
-        for page in range(pages):
-            job_ids = get_job_ids(base_url, role, page)
-            for job_id in job_ids:
-                job_details.append(get_job_details(job_id))
+    fetcher = LinkedInFetcher(max_workers, rate_limit, cache=cache)
+    try:
+        job_ids = discover_job_ids(base_url, job_roles, pages, fetcher, parser)
+        job_details = fetch_job_details(job_ids, fetcher, job_url, parser)
+        print(f"Made {fetcher.request_count} requests at {fetcher.requests_per_second():.2f} requests/sec")
+    finally:
+        fetcher.close()
 
     return pd.DataFrame(job_details)
 
 
-def get_job_ids(base_url, role, page):
+def scrape_linkedin_jobs_incremental(job_roles, output_csv_path, index_path, pages=1, refresh_days=7,
+                                     max_workers=1, rate_limit=None, base_url=BASE_URL,
+                                     job_url=JOB_POSTING_URL, cache=None, parser='lxml'):
+    """
+    Scrapes only the LinkedIn job postings that are new or due for a refresh and merges
+    them into the stored dataset.
+
+    The index at index_path records the first and last time each job ID was discovered
+    and when its details were last fetched. Rows in output_csv_path carry a job-id column
+    so refreshed postings replace their previous version. Postings that fail to load,
+    e.g. when LinkedIn rate limits or blocks the request, are not saved and are fetched
+    again on the next run.
+
+    Args:
+    job_roles (list): A list of job roles to search for.
+    output_csv_path (str): Path of the stored dataset to merge new rows into.
+    index_path (str): Path of the CSV index of known job IDs.
+    pages (int): Maximum number of pages to scrape for each job role.
+    refresh_days (float): Refetch details of known postings last fetched this many days ago.
+    max_workers (int): Maximum number of requests in flight at once.
+    rate_limit (float): Maximum requests per second per host. None disables limiting.
+    base_url (str): The base URL for LinkedIn job search.
+    job_url (str): The base URL for LinkedIn job postings.
+    cache (ResponseCache): Optional persistent cache for job posting pages.
+    parser (str): HTML parser backend, 'lxml' (compiled selectors) or 'bs4'.
+
+    Returns:
+    DataFrame: The merged dataset, which is also written to output_csv_path.
+    """
+    now = pd.Timestamp.now()
+    index = load_job_index(index_path)
+
+    fetcher = LinkedInFetcher(max_workers, rate_limit, cache=cache)
+    try:
+        job_ids = discover_job_ids(base_url, job_roles, pages, fetcher, parser)
+        stale_before = now - pd.Timedelta(days=refresh_days)
+        known = index.loc[index.index.intersection(job_ids), 'last-fetched']
+        fresh_ids = set(known[known >= stale_before].index)
+        to_fetch = [job_id for job_id in job_ids if job_id not in fresh_ids]
+        print(f"Fetching {len(to_fetch)} new or stale postings, skipping {len(fresh_ids)} known ones")
+
+        job_details = fetch_job_details(to_fetch, fetcher, job_url, parser)
+        print(f"Made {fetcher.request_count} requests at {fetcher.requests_per_second():.2f} requests/sec")
+    finally:
+        fetcher.close()
+
+    new_rows = pd.DataFrame(job_details, columns=JOB_DETAIL_FIELDS)
+    new_rows.insert(0, 'job-id', to_fetch)
+    # Failed and blocked pages parse to a posting without a company
+    new_rows = new_rows[new_rows['company'].notna()]
+    fetched_ids = list(new_rows['job-id'])
+    if len(fetched_ids) < len(to_fetch):
+        print(f"{len(to_fetch) - len(fetched_ids)} postings failed to load and will be retried next run")
+
+    if os.path.exists(output_csv_path):
+        stored = pd.read_csv(output_csv_path, dtype={'job-id': str})
+        if 'job-id' not in stored.columns:
+            stored.insert(0, 'job-id', None)
+        # Rows saved before job IDs were recorded are kept, unless a posting fetched in this
+        # run has the same company, title and level
+        unidentified = stored['job-id'].isna()
+        refetched = pd.MultiIndex.from_frame(stored[MATCH_FIELDS]).isin(
+            pd.MultiIndex.from_frame(new_rows[MATCH_FIELDS]))
+        if (unidentified & refetched).any():
+            print(f"Replacing {(unidentified & refetched).sum()} stored rows without a job ID by their fetched postings")
+        stored = stored[~(unidentified & refetched) & ~stored['job-id'].isin(fetched_ids)]
+        new_rows = pd.concat([stored, new_rows], ignore_index=True, sort=False)
+    new_rows.to_csv(output_csv_path, index=False)
+
+    new_ids = pd.Index(job_ids).difference(index.index)
+    index = index.reindex(index.index.union(new_ids))
+    index.loc[new_ids, 'first-seen'] = now
+    index.loc[job_ids, 'last-seen'] = now
+    index.loc[fetched_ids, 'last-fetched'] = now
+    index.rename_axis('job-id').to_csv(index_path)
+
+    return new_rows
+
+
+def load_job_index(index_path):
+    """
+    Loads the index of known LinkedIn job IDs.
+
+    Args:
+    index_path (str): Path of the CSV index.
+
+    Returns:
+    DataFrame: Timestamps first-seen, last-seen and last-fetched indexed by job ID.
+    """
+    columns = ['first-seen', 'last-seen', 'last-fetched']
+    if not os.path.exists(index_path):
+        return pd.DataFrame({column: pd.Series(dtype='datetime64[ns]') for column in columns},
+                            index=pd.Index([], dtype=str, name='job-id'))
+    return pd.read_csv(index_path, dtype={'job-id': str}, index_col='job-id', parse_dates=columns)
+
+
+def fetch_job_details(job_ids, fetcher, job_url=JOB_POSTING_URL, parser='lxml'):
+    """
+    Fetches details for many job postings concurrently.
+
+    Args:
+    job_ids (list): IDs of the job postings.
+    fetcher (LinkedInFetcher): Fetcher whose max_workers bounds the requests in flight.
+    job_url (str): The base URL for LinkedIn job postings.
+    parser (str): HTML parser backend, 'lxml' or 'bs4'.
+
+    Returns:
+    list: Dictionaries of job details in the order of job_ids.
+    """
+    with ThreadPoolExecutor(max_workers=fetcher.max_workers) as executor:
+        return list(executor.map(lambda job_id: get_job_details(job_id, fetcher, job_url, parser), job_ids))
+
+
+def discover_job_ids(base_url, job_roles, pages, fetcher, parser='lxml'):
     """
-    Fetches job IDs for a specific role and page.
+    Discovers unique job IDs for all job roles, paging each role in parallel.
+
+    Each role pages until a page brings no IDs new to that role, so results shared with
+    another role don't cut its search short. IDs found by several roles are kept once,
+    at their first role's position.
+
+    Args:
+    base_url (str): The base URL for LinkedIn job search.
+    job_roles (list): A list of job roles to search for.
+    pages (int): Maximum number of pages to scrape for each job role.
+    fetcher (LinkedInFetcher): Fetcher used for the search requests.
+    parser (str): HTML parser backend, 'lxml' or 'bs4'.
+
+    Returns:
+    list: Job IDs in role order, each appearing once.
+    """
+    def discover_role(role):
+        role_ids = {}
+        start = 0
+        for _ in range(pages):
+            job_ids = get_job_ids(base_url, role, start, fetcher, parser)
+            new_ids = [job_id for job_id in job_ids if job_id not in role_ids]
+            if not new_ids:
+                break
+            role_ids.update(dict.fromkeys(new_ids))
+            start += len(job_ids)
+        return list(role_ids)
+
+    with ThreadPoolExecutor(max_workers=min(fetcher.max_workers, max(1, len(job_roles)))) as executor:
+        role_ids = list(executor.map(discover_role, job_roles))
+
+    # Roles are merged in order, so which role keeps a shared ID doesn't depend on timing
+    job_ids = list(dict.fromkeys(job_id for ids in role_ids for job_id in ids))
+    print(f"Discovered {len(job_ids)} unique job IDs across {len(job_roles)} roles")
+    return job_ids
+
+
+def get_job_ids(base_url, role, start, fetcher=None, parser='lxml'):
+    """
+    Fetches job IDs for a specific role starting at a result offset.
 
     Args:
     base_url (str): The base URL for LinkedIn job search.
     role (str): The job role to search for.
-    page (int): The page number to scrape.
+    start (int): Offset of the first result to return.
+    fetcher (LinkedInFetcher): Optional fetcher to reuse pooled connections.
+    parser (str): HTML parser backend, 'lxml' or 'bs4'.
 
     Returns:
     list: A list of job IDs.
@@ -42,44 +348,117 @@ def get_job_ids(base_url, role, page):
     headers = get_headers()
     encoded_role = urllib.parse.quote(role)
     try:
-        print(f"Fetching job IDs for {role} on page {page} with URL: {base_url}keywords={encoded_role}&start={page}")
-        response = requests.get(
-            f"{base_url}keywords={encoded_role}&start={page}", headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        return [job.find("div", {"class": "base-card"}).get('data-entity-urn').split(":")[3]
-                for job in soup.find_all("li") if job.find("div", {"class": "base-card"})]
+        url = f"{base_url}keywords={encoded_role}&start={start}"
+        print(f"Fetching job IDs for {role} from offset {start} with URL: {url}")
+        response = fetcher.get(url) if fetcher else requests.get(url, headers=headers)
+        return parse_job_ids(response.content, parser)
     except Exception as e:
         print(f"Error fetching job IDs: {e}")
         return []
 
 
-def get_job_details(job_id):
+def parse_job_ids(body, parser='lxml'):
+    """
+    Parses job IDs out of a job search results page.
+
+    Args:
+    body (bytes or str): HTML of the search results page.
+    parser (str): HTML parser backend, 'lxml' or 'bs4'.
+
+    Returns:
+    list: A list of job IDs.
+    """
+    if parser == 'lxml':
+        document = parse_document(body)
+        if document is None:
+            return []
+        return [urn.split(":")[3] for urn in JOB_IDS_XPATH(document)]
+    soup = BeautifulSoup(body, 'html.parser')
+    return [job.find("div", {"class": "base-card"}).get('data-entity-urn').split(":")[3]
+            for job in soup.find_all("li") if job.find("div", {"class": "base-card"})]
+
+
+def get_job_details(job_id, fetcher=None, job_url=JOB_POSTING_URL, parser='lxml'):
     """
     Fetches details of a job posting using its job ID.
 
     Args:
     job_id (str): The ID of the job posting.
+    fetcher (LinkedInFetcher): Optional fetcher to reuse pooled connections.
+    job_url (str): The base URL for LinkedIn job postings.
+    parser (str): HTML parser backend, 'lxml' or 'bs4'.
 
     Returns:
     dict: A dictionary containing details of the job posting.
     """
     headers = get_headers()
     try:
-        response = requests.get(
-            f'https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}', headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        job_info = {"company": None, "job-title": None,
-                    "level": None, "employment type": None}
+        url = f'{job_url}{job_id}'
+        body = fetcher.get_cached(url) if fetcher else requests.get(url, headers=headers).content
+        return parse_job_posting(body, parser)
+    except Exception as e:
+        print(f"Error fetching job details: {e}")
+        return dict.fromkeys(JOB_DETAIL_FIELDS)
+
+
+def parse_job_posting(body, parser='lxml'):
+    """
+    Parses the details of a job posting page.
+
+    The 'lxml' backend parses the document once and pulls every field with compiled
+    XPath selectors; the 'bs4' backend runs the BeautifulSoup extractors below.
 
-        # Extract job details
-        job_info["company"] = extract_company(soup)
-        job_info["job-title"] = extract_job_title(soup)
-        job_info.update(extract_job_criteria(soup))
+    Args:
+    body (bytes or str): HTML of the job posting page.
+    parser (str): HTML parser backend, 'lxml' or 'bs4'.
 
+    Returns:
+    dict: A dictionary containing details of the job posting.
+    """
+    job_info = dict.fromkeys(JOB_DETAIL_FIELDS)
+
+    if parser == 'lxml':
+        document = parse_document(body)
+        if document is None:
+            return job_info
+        company = COMPANY_XPATH(document)
+        job_info["company"] = company[0] if company else None
+        title = JOB_TITLE_XPATH(document)
+        job_info["job-title"] = title[0].text_content().strip() if title else None
+        for li in CRITERIA_XPATH(document):
+            text = li.text_content()
+            if "Seniority level" in text:
+                job_info["level"] = text.replace("Seniority level", "").strip()
+            elif "Employment type" in text:
+                span = CRITERIA_TEXT_XPATH(li)
+                if span:
+                    job_info["employment type"] = span[0].text_content().strip()
         return job_info
-    except Exception as e:
-        print(f"Error fetching job details: {e}")
-        return {"company": None, "job-title": None, "level": None, "employment type": None}
+
+    soup = BeautifulSoup(body, 'html.parser')
+
+    # Extract job details
+    job_info["company"] = extract_company(soup)
+    job_info["job-title"] = extract_job_title(soup)
+    job_info.update(extract_job_criteria(soup))
+
+    return job_info
+
+
+def parse_document(body):
+    """
+    Parses HTML into an lxml document.
+
+    Args:
+    body (bytes or str): HTML to parse.
+
+    Returns:
+    lxml.html.HtmlElement: Root of the document, or None if the HTML is empty.
+    """
+    try:
+        return html.fromstring(body)
+    except etree.ParserError:
+        return None
 
 
 def get_headers():
@@ -169,7 +548,7 @@ def extract_job_criteria(soup):
 
 if __name__ == "__main__":
     job_roles = ['Software Engineer']
-    df = scrape_linkedin_jobs(job_roles, 2)
+    df = scrape_linkedin_jobs(job_roles, 2, max_workers=8, rate_limit=5)
     print(df.head())
     df.to_csv("scrape/linkedin/test_linkedin_jobs.csv", index=False)
     print("LinkedIn jobs scraped successfully!")
@@ -0,0 +1,150 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+class ResponseCache:
+    """
+    A persistent HTTP response cache stored in SQLite, shared by all scrapers.
+
+    Entries are keyed by URL plus the request headers that affect the response,
+    expire after a per-source TTL and are evicted least-recently-used once the
+    stored bodies exceed max_bytes.
+    """
+
+    FOREVER = float('inf')
+    DEFAULT_TTLS = {
+        'linkedin': 24 * 60 * 60,
+        'glassdoor': 12 * 60 * 60,
+        'h1b': 24 * 60 * 60,
+    }
+
+    def __init__(self, path, ttls=None, max_bytes=512 * 1024 * 1024):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            ttls (dict): Time to live in seconds per source, merged over DEFAULT_TTLS.
+            max_bytes (int): Maximum total size of cached bodies before eviction.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(url, headers=None):
+        """
+        Builds the cache key for a request.
+
+        Args:
+            url (str): Requested URL.
+            headers (dict): Request headers that affect the response.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        parts = [url] + [f"{name.lower()}:{value}" for name, value in sorted((headers or {}).items())]
+        return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, url, headers=None):
+        """
+        Returns the cached body for a request if present and not expired.
+
+        Args:
+            url (str): Requested URL.
+            headers (dict): Request headers that affect the response.
+
+        Returns:
+            bytes: The cached body, or None on a miss.
+        """
+        key = self.make_key(url, headers)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            body, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._delete(key)
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        return body
+
+    def set(self, url, body, source, headers=None, ttl=None):
+        """
+        Stores a response body.
+
+        Args:
+            url (str): Requested URL.
+            body (bytes or str): Response body; strings are stored UTF-8 encoded.
+            source (str): Source name used to look up the default TTL.
+            headers (dict): Request headers that affect the response.
+            ttl (float): Time to live in seconds, overriding the source TTL.
+                Use ResponseCache.FOREVER for content that never changes.
+        """
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        ttl = self.ttls.get(source) if ttl is None else ttl
+        now = time.time()
+        expires_at = None if ttl is None or ttl == self.FOREVER else now + ttl
+        key = self.make_key(url, headers)
+        with self.lock:
+            self._delete(key)
+            self.conn.execute(
+                "INSERT INTO responses (key, url, source, body, size, fetched_at, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, source, body, len(body), now, expires_at, now))
+            self.total_bytes += len(body)
+            self._evict()
+            self.conn.commit()
+
+    def _delete(self, key):
+        """Deletes an entry and updates the running size. Caller holds the lock."""
+        row = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.total_bytes -= row[0]
+
+    def _evict(self):
+        """Removes expired, then least recently used, entries until under max_bytes. Caller holds the lock."""
+        if self.total_bytes <= self.max_bytes:
+            return
+        self.conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        for key, size in self.conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if self.total_bytes <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.total_bytes -= size
+        self.logger.info(f"Evicted cache entries, {self.total_bytes} bytes remain")
+
+    def close(self):
+        """Closes the cache database."""
+        self.conn.close()
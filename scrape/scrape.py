@@ -1,13 +1,15 @@
 from glassdoor.scrape_glassdoor import scrape_glassdoor_jobs
-from h1b.scrape_h1b import H1B_Scraper
-from linkedin.scrape_linkedin import scrape_linkedin_jobs
+from h1b.scrape_h1b import H1B_Scraper, H1BParquetSink
+from linkedin.scrape_linkedin import scrape_linkedin_jobs_incremental
+from response_cache import ResponseCache
 from dotenv import load_dotenv
-from constants import LINKEDIN_SCRAPED, GLASSDOOR_SCRAPED, H1B_SCRAPED
+from constants import LINKEDIN_SCRAPED, GLASSDOOR_SCRAPED, H1B_DATASET, RESPONSE_CACHE, LINKEDIN_INDEX
 import os
 
 
 def main():
     load_dotenv()
+    cache = ResponseCache(RESPONSE_CACHE)
 
     # Scrape Glassdoor jobs
     try:
@@ -37,19 +39,20 @@ def main():
         }
 
         print("Scraping Glassdoor jobs...")
-        scrape_glassdoor_jobs(technologies, locations, os.getenv(
-            'CHROME_DRIVER_PATH'), GLASSDOOR_SCRAPED)
-        print("Glassdoor jobs scraped successfully!")
+        failed = scrape_glassdoor_jobs(technologies, locations, os.getenv(
+            'CHROME_DRIVER_PATH'), GLASSDOOR_SCRAPED, cache=cache, workers=4, page_delay=2)
+        if not failed:
+            print("Glassdoor jobs scraped successfully!")
     except Exception as e:
         print(f"Error scraping Glassdoor jobs: {e}")
 
     # Scrape H1B data
     try:
         print("Scraping H1B data...")
-        scraper = H1B_Scraper()
-        h1b_data = scraper.scrape([2018, 2019, 2020, 2021, 2022, 2023], ['Software Engineer', 'Data Scientist',
-                                  'Product Manager', 'Graphic Designer', 'Marketing Manager', 'Sales'])
-        h1b_data.to_csv(H1B_SCRAPED, index=False)
+        scraper = H1B_Scraper(cache=cache, max_workers=6)
+        scraper.scrape([2018, 2019, 2020, 2021, 2022, 2023], ['Software Engineer', 'Data Scientist',
+                       'Product Manager', 'Graphic Designer', 'Marketing Manager', 'Sales'],
+                       sink=H1BParquetSink(H1B_DATASET))
         print("H1B data scraped successfully!")
     except Exception as e:
         print(f"Error scraping H1B data: {e}")
@@ -59,12 +62,14 @@ def main():
         print("Scraping LinkedIn jobs...")
         job_roles = ['Software Engineer', 'Data Scientist',
                      'Product Manager', 'Graphic Designer', 'Marketing Manager', 'Sales']
-        df = scrape_linkedin_jobs(job_roles, 30)
-        df.to_csv(LINKEDIN_SCRAPED, index=False)
+        scrape_linkedin_jobs_incremental(job_roles, LINKEDIN_SCRAPED, LINKEDIN_INDEX, pages=30,
+                                         max_workers=8, rate_limit=5, cache=cache)
         print("LinkedIn jobs scraped successfully!")
     except Exception as e:
         print(f"Error scraping LinkedIn jobs: {e}")
 
+    cache.close()
+
 
 if __name__ == "__main__":
     print("Starting scrape jobs for Linkedin, Glassdoor and H1B.")